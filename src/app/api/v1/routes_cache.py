@@ -10,7 +10,6 @@ from app.services.cache import (
 
 router = APIRouter(prefix='/cache', tags=['cache'])
 
-
 @router.get('/status')
 async def cache_status():
     """
@@ -18,8 +18,9 @@ from app.services.proimobil_api_service import (
     get_detailed_proimobil_api_listings
 )
 from app.services.market_analytics import (
-    analyze_market,
+    analyze_market_cached,
     score_property,
+    score_properties,
     get_price_predictions,
     find_similar_properties,
     MarketInsights
@@ -811,11 +812,12 @@ async def quartiles():
             "outliers_removed": 0
         }
 
-    # Calculate quartiles
-    quartiles_data = calculate_quartiles(all_prices)
+    # Sort the combined list once; quartiles and outlier fences both read it
+    all_prices.sort()
+    quartiles_data = calculate_quartiles(all_prices, presorted=True)
 
     # Detect and count outliers
-    filtered_prices, num_outliers = remove_outliers_iqr(all_prices)
+    _, num_outliers = remove_outliers_iqr(all_prices, presorted=True)
 
     # Interpretation (in English)
     q1 = quartiles_data['q1']
@@ -952,7 +954,7 @@ async def market_insights():
         raise HTTPException(status_code=404, detail="No listings available for analysis")
 
     # Analyze market
-    insights = analyze_market(listings)
+    insights = analyze_market_cached(listings)
     result = asdict(insights)
 
     # Cache for 30 minutes
@@ -1007,7 +1009,7 @@ async def property_score(listing_id: str):
     if cached_insights:
         insights = _reconstruct_market_insights(cached_insights)
     else:
-        insights = analyze_market(listings)
+        insights = analyze_market_cached(listings)
         cache.set('market_insights', asdict(insights), source='api_request')
 
     # Score the property
@@ -1063,7 +1065,7 @@ async def predict_price(
             listings = cached_listings_data.get('listings', [])
         else:
             listings = get_detailed_proimobil_api_listings()
-        insights = analyze_market(listings)
+        insights = analyze_market_cached(listings)
         cache.set('market_insights', asdict(insights), source='api_request')
 
     # Get prediction
@@ -1168,17 +1170,14 @@ async def best_deals(
     if cached_insights:
         insights = _reconstruct_market_insights(cached_insights)
     else:
-        insights = analyze_market(listings)
+        insights = analyze_market_cached(listings)
         cache.set('market_insights', asdict(insights), source='api_request')
 
     # Score all properties
-    scored_properties = []
-    for listing in listings:
-        score = score_property(listing, insights)
-        scored_properties.append({
-            'listing': listing,
-            'score': asdict(score)
-        })
+    scored_properties = [
+        {'listing': listing, 'score': asdict(score)}
+        for listing, score in zip(listings, score_properties(listings, insights))
+    ]
 
     # Sort by overall score
     scored_properties.sort(key=lambda x: x['score']['overall_score'], reverse=True)
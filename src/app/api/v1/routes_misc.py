@@ -1,14 +1,20 @@
 from fastapi import APIRouter
 from datetime import datetime
+from functools import lru_cache
+import time
 
 router = APIRouter(tags=['misc'])
 
-@router.get('/day')
-async def day():
+@lru_cache(maxsize=1)
+def _day_for_second(second: int) -> dict:
+    # one payload per wall-clock second; callers only serialize it
     now = datetime.utcnow()
     return {"day": now.strftime('%d.%m.%Y'), "full_date": now.isoformat()}
 
+@router.get('/day')
+async def day():
+    return _day_for_second(int(time.time()))
+
 @router.get('/health')
 async def health():
     return {"status": "ok"}
-
@@ -74,13 +74,14 @@ def calculate(config: Dict[str, Any]) -> Dict[str, float]:
     mdl_needed_for_ron = eur_to_ron * ron_to_mdl
     conversion_coef = ((mdl_needed_for_ron - eur_to_mdl) / eur_to_mdl) if (conversion_enabled and eur_to_mdl > 0) else 0.0
 
-    denom = (1 - agent_coef - tax_coef) * (1 - conversion_coef)
+    conversion_keep = 1 - conversion_coef
+    denom = (1 - agent_coef - tax_coef) * conversion_keep
     if denom <= 0:
         return {"error": 1, "message": "Coefficients (agent/tax/convert) produce denom=0; adjust percentages."}
 
-    numerator = target_with_notary + lost_rental * (1 - conversion_coef)
+    numerator = target_with_notary + lost_rental * conversion_keep
     if income_enabled:
-        numerator -= old_purchase * tax_coef * (1 - conversion_coef)
+        numerator -= old_purchase * tax_coef * conversion_keep
 
     sale_price = numerator / denom
     agent_fee_val = sale_price * agent_coef
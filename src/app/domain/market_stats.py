@@ -9,7 +9,7 @@ class HistogramBin:
     percentage: float = 0.0
     label: str = ""
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketStats:
     source: str
     url: Optional[str]
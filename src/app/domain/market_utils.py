@@ -1,4 +1,6 @@
 # Compatibility shim for legacy histogram utilities
+from bisect import bisect_left
+from operator import attrgetter
 from typing import List, Dict
 from app.domain.market_stats import HistogramBin
 
@@ -13,16 +15,20 @@ _LEGACY_INTERVALS = [
     (3000, None, ">3000"),
 ]
 
+# Bin edges are fixed, so their starts are computed once at import
+_LEGACY_STARTS = tuple(start for start, _, _ in _LEGACY_INTERVALS)
+
 def build_price_histogram(prices_per_sqm: List[float]) -> List[HistogramBin]:
     if not prices_per_sqm:
         return []
     total = len(prices_per_sqm)
+    # sort once in C, then each bin count is a difference of bisect positions
+    ordered = sorted(prices_per_sqm)
+    positions = [bisect_left(ordered, start) for start in _LEGACY_STARTS]
+    positions.append(total)
+    counts = [hi - lo for lo, hi in zip(positions, positions[1:])]
     histogram: List[HistogramBin] = []
-    for start, end, label in _LEGACY_INTERVALS:
-        if end is None:
-            count = sum(1 for price in prices_per_sqm if price >= start)
-        else:
-            count = sum(1 for price in prices_per_sqm if start <= price < end)
+    for (start, end, label), count in zip(_LEGACY_INTERVALS, counts):
         # Keep empty bins below 3000 as per original logic (tests rely on their presence)
         if count > 0 or (end is not None and end <= 3000):
             histogram.append(HistogramBin(
@@ -38,7 +44,7 @@ def get_price_distribution_summary(prices_per_sqm: List[float]) -> Dict:
     if not prices_per_sqm:
         return {"total_ads": 0, "histogram": [], "dominant_range": None, "dominant_percentage": 0.0}
     histogram = build_price_histogram(prices_per_sqm)
-    max_bin = max(histogram, key=lambda b: b.count) if histogram else None
+    max_bin = max(histogram, key=attrgetter('count')) if histogram else None
     return {
         "total_ads": len(prices_per_sqm),
         "histogram": histogram,
@@ -1,13 +1,20 @@
-import unicodedata, xml.etree.ElementTree as ET, xlrd, requests, logging, threading
+import unicodedata, xlrd, requests, logging, threading, time, concurrent.futures
 from datetime import date
 import datetime as _dt
 from typing import Optional, Dict, Any
 from requests.adapters import HTTPAdapter, Retry
+from lxml import etree
 
 BNM_XML_URL = "https://www.bnm.md/en/official_exchange_rates"
 BNR_XML_URL = "https://www.bnr.ro/nbrfxrates.xml"
 BNM_XLS_URL = "https://www.bnm.md/ro/export-medium-rates"
 logger = logging.getLogger(__name__)
+# Remote feeds are untrusted: no entity expansion, no network fetches from DTDs
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+# Compiled once; BNR elements are matched by local name whatever namespace the feed declares
+_BNM_EUR_XPATH = etree.XPath("Valute[CharCode='EUR']/Value/text()")
+_BNR_CUBE_XPATH = etree.XPath("//*[local-name()='Cube']")
+_BNR_EUR_XPATH = etree.XPath("*[local-name()='Rate'][@currency='EUR']/text()")
 _session_lock = threading.Lock()
 _session: Optional[requests.Session] = None
 
@@ -23,13 +30,16 @@ def _get_session() -> requests.Session:
                 _session = s
     return _session
 _RATES_CACHE: Dict[str, Any] = {}
-_RATES_CACHE_TS: Optional[_dt.datetime] = None
+_RATES_CACHE_TS: Optional[float] = None  # time.monotonic() of the last fetch
 _RATES_CACHE_TTL_SECONDS = 1800
 
 def _cache_valid() -> bool:
     if _RATES_CACHE_TS is None: return False
-    age = (_dt.datetime.now(_dt.timezone.utc) - _RATES_CACHE_TS).total_seconds()
-    return age < _RATES_CACHE_TTL_SECONDS
+    return time.monotonic() - _RATES_CACHE_TS < _RATES_CACHE_TTL_SECONDS
+
+def clear_rates_cache() -> None:
+    global _RATES_CACHE_TS; _RATES_CACHE_TS = None
+    _RATES_CACHE.clear()
 
 def _norm(s: str) -> str:
     if not isinstance(s, str): s = str(s)
@@ -41,12 +51,10 @@ def fetch_eur_mdl_from_bnm(session: Optional[requests.Session] = None) -> tuple[
     today_date = date.today(); today_str = today_date.strftime("%d.%m.%Y")
     resp = session.get(BNM_XML_URL, params={"get_xml":"1","date":today_str}, timeout=10)
     resp.raise_for_status()
-    root = ET.fromstring(resp.content); valcurs_date = root.attrib.get("Date", today_str)
-    eur_value = None
-    for val in root.findall("Valute"):
-        if val.findtext("CharCode") == "EUR":
-            raw = val.findtext("Value") or ""; eur_value = float(raw.replace(",",".")); break
-    if eur_value is None: raise RuntimeError("EUR not found in BNM XML")
+    root = etree.fromstring(resp.content, _XML_PARSER); valcurs_date = root.attrib.get("Date", today_str)
+    eur_values = _BNM_EUR_XPATH(root)
+    if not eur_values: raise RuntimeError("EUR not found in BNM XML")
+    eur_value = float(eur_values[0].replace(",","."))
     try: fx_date = _dt.datetime.strptime(valcurs_date, "%d.%m.%Y").date()
     except ValueError: fx_date = today_date
     label = f"BNM official EUR/MDL (XML, {valcurs_date})"
@@ -55,22 +63,18 @@ def fetch_eur_mdl_from_bnm(session: Optional[requests.Session] = None) -> tuple[
 def fetch_eur_ron_from_bnr(session: Optional[requests.Session] = None) -> tuple[float,str]:
     if session is None: session = _get_session()
     resp = session.get(BNR_XML_URL, timeout=10); resp.raise_for_status()
-    root = ET.fromstring(resp.content)
-    ns_uri = root.tag.split("}")[0].strip("{") if root.tag.startswith("{") else "http://www.bnr.ro/xsd"
-    ns = {"bnr": ns_uri}
-    cube = root.find(".//bnr:Body/bnr:Cube", ns) or root.find(".//bnr:Cube", ns)
-    if cube is None: raise RuntimeError("No Cube element in BNR XML")
+    cubes = _BNR_CUBE_XPATH(etree.fromstring(resp.content, _XML_PARSER))
+    if not cubes: raise RuntimeError("No Cube element in BNR XML")
+    cube = cubes[0]
     date_str = cube.attrib.get("date", "") or cube.attrib.get("Date", "")
     if date_str:
         try:
             if "-" in date_str: date_str = _dt.datetime.strptime(date_str, "%Y-%m-%d").date().strftime("%d.%m.%Y")
             else: _dt.datetime.strptime(date_str, "%d.%m.%Y")
         except ValueError: pass
-    eur_rate = None
-    for rate in cube.findall("bnr:Rate", ns):
-        if rate.attrib.get("currency") == "EUR":
-            eur_rate = float((rate.text or "0").replace(",",".")); break
-    if eur_rate is None: raise RuntimeError("EUR not found in BNR XML")
+    eur_rates = _BNR_EUR_XPATH(cube)
+    if not eur_rates: raise RuntimeError("EUR not found in BNR XML")
+    eur_rate = float(eur_rates[0].replace(",","."))
     label = f"BNR official EUR/RON (XML, {date_str})"
     return eur_rate,label
 
@@ -106,8 +110,12 @@ def fetch_ron_mdl_from_bnm_xls(target_date: Optional[_dt.date] = None, session:
 def fetch_all_rates(use_cache: bool = True) -> Dict[str, Any]:
     if use_cache and _cache_valid(): return _RATES_CACHE
     session = _get_session()
-    eur_to_mdl, bnm_label, fx_date = fetch_eur_mdl_from_bnm(session)
-    eur_to_ron, bnr_label = fetch_eur_ron_from_bnr(session)
+    # BNM and BNR are independent round trips; the XLS lookup below needs BNM's date
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
+        bnm = ex.submit(fetch_eur_mdl_from_bnm, session)
+        bnr = ex.submit(fetch_eur_ron_from_bnr, session)
+        eur_to_mdl, bnm_label, fx_date = bnm.result()
+        eur_to_ron, bnr_label = bnr.result()
     try:
         ron_to_mdl, ron_label = fetch_ron_mdl_from_bnm_xls(fx_date, session)
     except Exception:
@@ -122,8 +130,8 @@ def fetch_all_rates(use_cache: bool = True) -> Dict[str, Any]:
         "ron_to_mdl": ron_to_mdl,
         "ron_to_mdl_label": ron_label,
     }
-    global _RATES_CACHE_TS; _RATES_CACHE_TS = _dt.datetime.now(_dt.timezone.utc)
+    global _RATES_CACHE_TS; _RATES_CACHE_TS = time.monotonic()
     _RATES_CACHE.clear(); _RATES_CACHE.update(data)
     return data
 
-__all__ = ["fetch_all_rates", "fetch_eur_mdl_from_bnm", "fetch_eur_ron_from_bnr", "fetch_ron_mdl_from_bnm_xls", "_get_session", "_RATES_CACHE", "_RATES_CACHE_TS", "xlrd"]
+__all__ = ["fetch_all_rates", "clear_rates_cache", "fetch_eur_mdl_from_bnm", "fetch_eur_ron_from_bnr", "fetch_ron_mdl_from_bnm_xls", "_get_session", "_RATES_CACHE", "_RATES_CACHE_TS", "xlrd"]
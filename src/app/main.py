@@ -4,36 +4,31 @@ import logging, threading, asyncio, statistics as stats_mod
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 import colorlog
 from contextlib import asynccontextmanager
-# Add safe HTML import (WeasyPrint) for PDF tests monkeypatch compatibility
-try:
-    from weasyprint import HTML  # type: ignore
-except Exception:  # fallback stub
-    class HTML:  # minimal stub
-        def __init__(self, *args, **kwargs):
-            pass
-        def write_pdf(self):
-            return b"%PDF-STUB%"
+# PDF renderer class; WeasyPrint itself is imported on first render. Tests monkeypatch this name
+from app.services.pdf.pdf_service import HTML
 from app.core.config import get_settings
 from app.domain.market_stats import MarketStats
 # Updated imports from scraping layer
 from app.scraping.proimobil import (
-    compute_proimobil_stats,
     fetch_all_proimobil_prices,
+    proimobil_stats_from_prices,
 )
 from app.scraping.accesimobil import (
-    compute_stats_for_accesimobil,
+    accesimobil_stats_from_prices,
     fetch_all_prices_accesimobil,
 )
 from app.scraping.md999 import (
-    compute_999md_stats,
     fetch_all_999md_prices,
+    md999_stats_from_prices,
 )
 from app.services.histogram import get_price_distribution_summary
-from app.services.quartile_analysis import calculate_quartiles, remove_outliers_iqr
+from app.services.quartile_analysis import calculate_quartiles, median_of_sorted, remove_outliers_iqr
 
 # Routers (ensure these exist in api/ directory)
 from app.api.v1.routes_pdf import router as pdf_router
@@ -117,7 +112,7 @@ def _fmt_date(value: str) -> str:
         return value
 templates_env.filters["fmt_date"] = _fmt_date
 
-# Caching for aggregated market summary
+# Caching for aggregated market summary (stored as the encoded JSON body)
 MARKET_SUMMARY_TTL = timedelta(minutes=settings.market_summary_ttl_minutes)
 _market_summary_cache = None
 _market_summary_cache_ts = None
@@ -147,36 +142,47 @@ async def compute_aggregate_market_summary() -> dict:
     - sources: list of MarketStats for each source
     - quartile_analysis: overall market quartile analysis
     """
-    # Fetch stats from all sources (999.md is async, others are sync)
-    pro_stats = compute_proimobil_stats(settings.proimobil_url)
-    acc_stats = compute_stats_for_accesimobil(settings.accesimobil_url)
-    md999_stats = await compute_999md_stats(settings.md999_url)
+    # Scrape each source once, all sources concurrently
+    # (999.md is async, the others are sync and run in worker threads)
+    pro_prices, acc_prices, md999_prices = await asyncio.gather(
+        asyncio.to_thread(fetch_all_proimobil_prices, settings.proimobil_url),
+        asyncio.to_thread(fetch_all_prices_accesimobil, settings.accesimobil_url),
+        fetch_all_999md_prices(settings.md999_url),
+    )
+
+    # Per-source stats come from the same price lists as the aggregate
+    pro_stats = proimobil_stats_from_prices(settings.proimobil_url, pro_prices)
+    acc_stats = accesimobil_stats_from_prices(settings.accesimobil_url, acc_prices)
+    md999_stats = md999_stats_from_prices(settings.md999_url, md999_prices)
 
-    # Fetch all prices for distribution (reuse from stats to avoid double scraping)
+    # All prices for distribution
     all_prices: list[float] = []
-    all_prices.extend(fetch_all_proimobil_prices(settings.proimobil_url))
-    all_prices.extend(fetch_all_prices_accesimobil(settings.accesimobil_url))
-    all_prices.extend(await fetch_all_999md_prices(settings.md999_url))
+    all_prices.extend(pro_prices)
+    all_prices.extend(acc_prices)
+    all_prices.extend(md999_prices)
 
     if not all_prices:
         raise RuntimeError("No prices collected")
 
+    # Sort once; distribution, quartiles, median and min/max all read the sorted list
+    all_prices.sort()
+
     # Compute distribution for all combined prices
-    dist = get_price_distribution_summary(all_prices)
+    dist = get_price_distribution_summary(all_prices, presorted=True)
 
     # Calculate quartiles for aggregate
-    quartiles = calculate_quartiles(all_prices)
+    quartiles = calculate_quartiles(all_prices, presorted=True)
 
     # Detect outliers
-    _, num_outliers = remove_outliers_iqr(all_prices)
+    _, num_outliers = remove_outliers_iqr(all_prices, presorted=True)
 
     # Create aggregate stats
     all_stats = MarketStats(
         source="all", url=None, total_ads=len(all_prices),
-        min_price_per_sqm=round(min(all_prices), 2),
-        max_price_per_sqm=round(max(all_prices), 2),
+        min_price_per_sqm=round(all_prices[0], 2),
+        max_price_per_sqm=round(all_prices[-1], 2),
         avg_price_per_sqm=round(stats_mod.mean(all_prices), 2),
-        median_price_per_sqm=round(stats_mod.median(all_prices), 2),
+        median_price_per_sqm=round(median_of_sorted(all_prices), 2),
         price_histogram=dist["histogram"],
         dominant_range=dist["dominant_range"],
         dominant_percentage=dist["dominant_percentage"],
@@ -233,15 +239,17 @@ async def market_summary():
     now = datetime.now(timezone.utc)
     with _market_summary_lock:
         if _market_summary_cache and _market_summary_cache_ts and (now - _market_summary_cache_ts < MARKET_SUMMARY_TTL):
-            return _market_summary_cache
+            return Response(content=_market_summary_cache, media_type="application/json")
 
     # Call async function directly (no asyncio.to_thread needed)
     stats_list = await compute_aggregate_market_summary()
+    # Cache the encoded JSON body so hits skip jsonable_encoder and json.dumps
+    body = JSONResponse(content=jsonable_encoder(stats_list)).body
 
     with _market_summary_lock:
-        _market_summary_cache = stats_list
+        _market_summary_cache = body
         _market_summary_cache_ts = now
-    return stats_list
+    return Response(content=body, media_type="application/json")
 
 __all__ = ["app", "fetch_all_rates", "compute_aggregate_market_summary", "TEMPLATES_DIR", "templates_env", "HTML"]
 
@@ -1,9 +1,9 @@
 import logging, re, concurrent.futures, requests, warnings
-from statistics import mean, median
+from statistics import mean
 from typing import List
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 from app.domain.market_stats import MarketStats
-from app.services.quartile_analysis import calculate_quartiles
+from app.services.quartile_analysis import calculate_quartiles, median_of_sorted
 
 # Suppress SSL warnings for self-signed certificates
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
@@ -11,52 +11,56 @@ warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 logger = logging.getLogger(__name__)
 _session = requests.Session()
 _session.headers.update({"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) Chrome/118 Safari/537.36"})
+# Card price with the euro sign after or before the digits
+_PRICE_SUFFIX_RE = re.compile(r"([\d\s]+)\s*€")
+_PRICE_PREFIX_RE = re.compile(r"€\s*([\d\s]+)")
+# Cards of the first products container, and the text of a card's first mortgage line
+_CARDS_XPATH = etree.XPath(
+    "(//div[contains(@class, 'products')])[1]"
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' rs-card ')]"
+)
+_MORTGAGE_TEXT_XPATH = etree.XPath("string((.//div[contains(@class, 'mortgage')])[1])")
+# Page links of the first "pagination mt-20" block, inside its first "links" wrapper
+_PAGE_LINKS_XPATH = etree.XPath(
+    "(//div[contains(concat(' ', normalize-space(@class), ' '), ' pagination ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' mt-20 ')])[1]"
+    "/descendant::div[contains(@class, 'links')][1]//a[contains(@class, 'link')]"
+)
 
 
-def _extract_prices_from_html(html: str) -> List[float]:
-    soup = BeautifulSoup(html, "html.parser")
-    products_div = None
-    for d in soup.find_all("div"):
-        classes = d.get("class") or []
-        if any("products" in c for c in classes):
-            products_div = d; break
-    if products_div is None:
-        return []
-    cards = products_div.find_all("div", class_="rs-card")
+def _parse(html: str):
+    """One lxml tree per page, shared by page count detection and price extraction."""
+    try: return lxml_html.fromstring(html)
+    except etree.ParserError: return None  # empty document
+
+def _prices_in(root) -> List[float]:
     prices: List[float] = []
-    for card in cards:
-        mort_div = card.find("div", class_=lambda c: c and "mortgage" in c)
-        if not mort_div: continue
-        text = mort_div.get_text(" ", strip=True)
-        m = re.search(r"([\d\s]+)\s*€", text) or re.search(r"€\s*([\d\s]+)", text)
+    for card in _CARDS_XPATH(root):
+        text = _MORTGAGE_TEXT_XPATH(card)  # "" when the card has no mortgage line
+        m = _PRICE_SUFFIX_RE.search(text) or _PRICE_PREFIX_RE.search(text)
         if not m: continue
-        digits = "".join(ch for ch in m.group(1) if ch.isdigit())
-        if not digits: continue
-        try: prices.append(float(digits))
-        except ValueError: continue
+        digits = "".join(m.group(1).split())  # group is digits and whitespace only
+        if digits: prices.append(float(digits))
     return prices
 
-def _detect_total_pages(html: str) -> int:
-    soup = BeautifulSoup(html, "html.parser")
-    pag_div = None
-    for d in soup.find_all("div"):
-        classes = d.get("class") or []
-        if "pagination" in classes and "mt-20" in classes:
-            pag_div = d; break
-    if not pag_div: return 1
-    links_wrapper = pag_div.find("div", class_=lambda c: c and "links" in c)
-    if not links_wrapper: return 1
-    page_nums: List[int] = []
-    for a in links_wrapper.find_all("a", class_=lambda c: c and "link" in c):
-        txt = (a.get_text() or "").strip();
-        if txt.isdigit(): page_nums.append(int(txt))
+def _total_pages_in(root) -> int:
+    page_nums = [int(txt) for a in _PAGE_LINKS_XPATH(root) if (txt := a.text_content().strip()).isdigit()]
     return max(page_nums) if page_nums else 1
 
+def _extract_prices_from_html(html: str) -> List[float]:
+    root = _parse(html)
+    return _prices_in(root) if root is not None else []
+
+def _detect_total_pages(html: str) -> int:
+    root = _parse(html)
+    return _total_pages_in(root) if root is not None else 1
+
 def fetch_all_prices_accesimobil(base_url: str) -> List[float]:
     resp = _session.get(base_url, timeout=15, verify=False); resp.raise_for_status()
-    first_html = resp.text
-    total_pages = _detect_total_pages(first_html)
-    prices = _extract_prices_from_html(first_html)
+    root = _parse(resp.text)
+    if root is None: return []
+    total_pages = _total_pages_in(root)
+    prices = _prices_in(root)
     if total_pages > 1:
         def _fetch(page: int) -> tuple[int, str]:
             url = f"{base_url}&page={page}"; r = _session.get(url, timeout=15, verify=False); r.raise_for_status(); return page, r.text
@@ -66,17 +70,20 @@ def fetch_all_prices_accesimobil(base_url: str) -> List[float]:
     return prices
 
 def compute_stats_for_accesimobil(base_url: str) -> MarketStats:
-    prices = fetch_all_prices_accesimobil(base_url)
+    return accesimobil_stats_from_prices(base_url, fetch_all_prices_accesimobil(base_url))
+
+def accesimobil_stats_from_prices(base_url: str, prices: List[float]) -> MarketStats:
+    """Stats for prices already scraped from base_url."""
     if not prices: raise RuntimeError("No price values/m² were found on accesimobil.md")
     prices_sorted = sorted(prices)
 
     # Calculate quartiles
-    quartiles = calculate_quartiles(prices_sorted)
+    quartiles = calculate_quartiles(prices_sorted, presorted=True)
 
     return MarketStats(
         source="accesimobil.md", url=base_url, total_ads=len(prices_sorted),
         min_price_per_sqm=round(prices_sorted[0], 2), max_price_per_sqm=round(prices_sorted[-1], 2),
-        avg_price_per_sqm=round(mean(prices_sorted), 2), median_price_per_sqm=round(median(prices_sorted), 2),
+        avg_price_per_sqm=round(mean(prices_sorted), 2), median_price_per_sqm=round(median_of_sorted(prices_sorted), 2),
         q1_price_per_sqm=quartiles['q1'],
         q2_price_per_sqm=quartiles['q2'],
         q3_price_per_sqm=quartiles['q3'],
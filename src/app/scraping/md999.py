@@ -8,11 +8,11 @@ import logging
 import re
 import asyncio
 from pathlib import Path
-from statistics import mean, median
+from statistics import mean
 from typing import List, Optional
 from app.domain.market_stats import MarketStats
 from app.core.config import get_settings
-from app.services.quartile_analysis import calculate_quartiles
+from app.services.quartile_analysis import calculate_quartiles, median_of_sorted
 
 logger = logging.getLogger(__name__)
 
@@ -508,8 +508,11 @@ async def fetch_all_999md_prices(base_url: str, use_playwright: bool = True) ->
 
 async def compute_999md_stats(base_url: str) -> MarketStats:
     """Compute market statistics from 999.md listings."""
-    prices = await safe_fetch_999md_prices(base_url)
+    return md999_stats_from_prices(base_url, await safe_fetch_999md_prices(base_url))
 
+
+def md999_stats_from_prices(base_url: str, prices: List[float]) -> MarketStats:
+    """Statistics for prices already scraped from base_url; zeroed when there are none."""
     if not prices:
         return MarketStats(source="999.md", url=base_url, total_ads=0,
                            min_price_per_sqm=0.0, max_price_per_sqm=0.0,
@@ -520,13 +523,13 @@ async def compute_999md_stats(base_url: str) -> MarketStats:
     prices_sorted = sorted(prices)
     
     # Calculate quartiles
-    quartiles = calculate_quartiles(prices_sorted)
+    quartiles = calculate_quartiles(prices_sorted, presorted=True)
 
     return MarketStats(source="999.md", url=base_url, total_ads=len(prices_sorted),
-                       min_price_per_sqm=round(min(prices_sorted), 2),
-                       max_price_per_sqm=round(max(prices_sorted), 2),
+                       min_price_per_sqm=round(prices_sorted[0], 2),
+                       max_price_per_sqm=round(prices_sorted[-1], 2),
                        avg_price_per_sqm=round(mean(prices_sorted), 2),
-                       median_price_per_sqm=round(median(prices_sorted), 2),
+                       median_price_per_sqm=round(median_of_sorted(prices_sorted), 2),
                        q1_price_per_sqm=quartiles['q1'],
                        q2_price_per_sqm=quartiles['q2'],
                        q3_price_per_sqm=quartiles['q3'],
@@ -536,6 +539,7 @@ async def compute_999md_stats(base_url: str) -> MarketStats:
 __all__ = [
     "fetch_all_999md_prices",
     "compute_999md_stats",
+    "md999_stats_from_prices",
     "extract_price_from_text",
     "extract_area_from_text",
     "safe_fetch_999md_prices",
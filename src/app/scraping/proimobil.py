@@ -1,9 +1,9 @@
 import logging, re, requests, concurrent.futures, warnings
-from statistics import mean, median
+from statistics import mean
 from typing import List, Optional
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from app.domain.market_stats import MarketStats
-from app.services.quartile_analysis import calculate_quartiles
+from app.services.quartile_analysis import calculate_quartiles, median_of_sorted
 
 # Suppress SSL warnings for self-signed certificates
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
@@ -11,6 +11,12 @@ warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 logger = logging.getLogger(__name__)
 PRICE_RE = re.compile(r"([\d.,]+)")
 AREA_RE = re.compile(r"([\d.,]+)\s*m")
+# Only the pagination nav is built into a tree when reading the page count
+def _is_pagination(c) -> bool: return bool(c) and "Pagination_pagination" in c
+PAGINATION_ONLY = SoupStrainer("nav", class_=_is_pagination)
+# Only the listing container is built into a tree; headers, scripts and footers are skipped
+def _is_property_list(c) -> bool: return bool(c) and "PropertyListPage_property-list" in c
+PROPERTY_LIST_ONLY = SoupStrainer("div", class_=_is_property_list)
 
 session = requests.Session(); session.headers.update({"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) Chrome/118 Safari/537.36"})
 
@@ -31,18 +37,18 @@ def fetch_html(url: str) -> str:
     r = session.get(url, timeout=15, verify=False); r.raise_for_status(); return r.text
 
 def detect_total_pages(html: str) -> int:
-    soup = BeautifulSoup(html, "html.parser")
-    nav = soup.find("nav", class_=lambda c: c and "Pagination_pagination" in c)
+    soup = BeautifulSoup(html, "lxml", parse_only=PAGINATION_ONLY)
+    nav = soup.find("nav", class_=_is_pagination)
     if not nav: return 1
     last_number = 1
     for a in nav.select("ul li a"):
-        txt = (a.text or "").strip()
+        txt = a.get_text().strip()
         if txt.isdigit(): last_number = max(last_number, int(txt))
     return last_number
 
 def extract_prices_from_page(html: str) -> List[float]:
-    soup = BeautifulSoup(html, "html.parser")
-    root = soup.find("div", class_=lambda c: c and "PropertyListPage_property-list" in c)
+    soup = BeautifulSoup(html, "lxml", parse_only=PROPERTY_LIST_ONLY)
+    root = soup.find("div", class_=_is_property_list)
     if not root: return []
     cards = root.find_all("article", class_=lambda c: c and "PropertyCard_property-card" in c)
     results: List[float] = []
@@ -77,16 +83,20 @@ def fetch_all_proimobil_prices(base_url: str) -> List[float]:
     return all_prices
 
 def compute_proimobil_stats(base_url: str) -> MarketStats:
-    prices = fetch_all_proimobil_prices(base_url)
+    return proimobil_stats_from_prices(base_url, fetch_all_proimobil_prices(base_url))
+
+def proimobil_stats_from_prices(base_url: str, prices: List[float]) -> MarketStats:
+    """Stats for prices already scraped from base_url; sorts `prices` in place."""
     if not prices: raise RuntimeError("No price values/m² were found on proimobil.md")
 
-    # Calculate quartiles
-    quartiles = calculate_quartiles(prices)
+    # One in-place sort feeds min/max, median and quartiles
+    prices.sort()
+    quartiles = calculate_quartiles(prices, presorted=True)
 
     return MarketStats(
         source="proimobil.md", url=base_url, total_ads=len(prices),
-        min_price_per_sqm=round(min(prices), 2), max_price_per_sqm=round(max(prices), 2),
-        avg_price_per_sqm=round(mean(prices), 2), median_price_per_sqm=round(median(prices), 2),
+        min_price_per_sqm=round(prices[0], 2), max_price_per_sqm=round(prices[-1], 2),
+        avg_price_per_sqm=round(mean(prices), 2), median_price_per_sqm=round(median_of_sorted(prices), 2),
         q1_price_per_sqm=quartiles['q1'],
         q2_price_per_sqm=quartiles['q2'],
         q3_price_per_sqm=quartiles['q3'],
@@ -95,5 +105,5 @@ def compute_proimobil_stats(base_url: str) -> MarketStats:
 
 __all__ = [
     "extract_price", "extract_area", "fetch_html", "detect_total_pages", "extract_prices_from_page",
-    "fetch_all_proimobil_prices", "compute_proimobil_stats"
+    "fetch_all_proimobil_prices", "compute_proimobil_stats", "proimobil_stats_from_prices"
 ]
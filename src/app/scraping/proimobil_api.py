@@ -3,6 +3,8 @@ Direct REST API calls to proimobil.md - clean JSON response, no scraping needed.
 Uses the official proimobil.md API endpoint: https://api.proimobil.md/v1/properties
 """
 
+import concurrent.futures
+import functools
 import logging
 from typing import List, Dict, Any, Optional
 import requests
@@ -14,10 +16,25 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
+# Pooled connection reused across paginated requests
+_session = requests.Session()
+
+# Upper bound on pages in flight; stays within the session's connection pool
+_MAX_CONCURRENT_PAGES = 8
+
 
 class ProimobilAPIListing:
     """Represents a single property listing from proimobil REST API."""
     
+    # Fixed attribute layout: no per-instance __dict__, cheaper attribute reads
+    __slots__ = (
+        'price_eur', 'city', 'city_id', 'sector', 'street', 'rooms',
+        'surface_sqm', 'price_per_sqm', 'listing_id', 'offer', 'category',
+        'status', 'is_hot', 'is_exclusive', 'deal', 'booked', 'order', 'views',
+        'floor', 'number_of_floors', 'bathrooms', 'bedrooms', 'balcony',
+        'state', 'parking', 'condition', 'updated_at', 'created_at', 'url',
+    )
+    
     def __init__(
         self,
         price_eur: float,
@@ -146,14 +163,15 @@ def _parse_property_from_api_response(prop: Dict[str, Any]) -> Optional[Proimobi
         created_at_str = prop.get("createdAt", "")
         updated_at = None
         created_at = None
+        # Python 3.11+ fromisoformat parses the trailing "Z" itself
         if updated_at_str:
             try:
-                updated_at = datetime.fromisoformat(updated_at_str.replace("Z", "+00:00"))
+                updated_at = datetime.fromisoformat(updated_at_str)
             except Exception:
                 updated_at = None
         if created_at_str:
             try:
-                created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
+                created_at = datetime.fromisoformat(created_at_str)
             except Exception:
                 created_at = None
 
@@ -218,13 +236,16 @@ def _extract_listings_from_api_response(data: List[Dict[str, Any]]) -> List[Proi
     return listings
 
 
-def fetch_proimobil_api_page(offset: int = 0, limit: int = 150) -> List[ProimobilAPIListing]:
+def fetch_proimobil_api_page(
+    offset: int = 0, limit: int = 150, session: Optional[requests.Session] = None
+) -> List[ProimobilAPIListing]:
     """
     Fetch listings from proimobil.md REST API.
     
     Args:
         offset: Offset for pagination (0-based)
         limit: Number of items to fetch (max 150)
+        session: HTTP session to use (defaults to the module's pooled session)
     
     Returns:
         List of ProimobilAPIListing objects
@@ -249,7 +270,7 @@ def fetch_proimobil_api_page(offset: int = 0, limit: int = 150) -> List[Proimobi
     
     try:
         logger.info(f"Fetching proimobil API: offset={offset}, limit={limit}")
-        resp = requests.get(base_url, params=params, headers=headers, timeout=15, verify=False)
+        resp = (session or _session).get(base_url, params=params, headers=headers, timeout=15, verify=False)
         resp.raise_for_status()
         
         # Parse JSON response
@@ -274,25 +295,35 @@ def fetch_proimobil_api_page(offset: int = 0, limit: int = 150) -> List[Proimobi
         return []
 
 
-def fetch_all_proimobil_api_listings(max_items: int = 1000) -> List[ProimobilAPIListing]:
+def fetch_all_proimobil_api_listings(
+    max_items: int = 1000, session: Optional[requests.Session] = None
+) -> List[ProimobilAPIListing]:
     """
     Fetch all available listings from proimobil.md API.
     
+    The first page is fetched alone, which opens the pooled connection and
+    settles small result sets in one request; the remaining pages are then
+    requested concurrently. Pages are read back in offset order and stop at
+    the first empty or short page, as a sequential scan would.
+    
     Args:
         max_items: Maximum number of items to fetch total
+        session: HTTP session to use (defaults to the module's pooled session)
     
     Returns:
         List of all ProimobilAPIListing objects
     """
     all_listings = []
-    offset = 0
     batch_size = 150  # API maximum
+    offsets = range(0, max_items, batch_size)
 
-    
-    while offset < max_items:
-        # Fetch one batch
-        listings = fetch_proimobil_api_page(offset=offset, limit=batch_size)
-        
+    fetch_page = functools.partial(fetch_proimobil_api_page, limit=batch_size, session=session)
+    pages = [fetch_page(0)] if offsets else []
+    if len(offsets) > 1 and len(pages[0]) == batch_size:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(offsets) - 1, _MAX_CONCURRENT_PAGES)) as ex:
+            pages.extend(ex.map(fetch_page, offsets[1:]))
+
+    for offset, listings in zip(offsets, pages):
         if not listings:
             logger.info(f"No more listings found at offset {offset}, stopping pagination")
             break
@@ -303,8 +334,6 @@ def fetch_all_proimobil_api_listings(max_items: int = 1000) -> List[ProimobilAPI
         if len(listings) < batch_size:
             logger.info(f"Got {len(listings)} < {batch_size}, reached end of listings")
             break
-        
-        offset += batch_size
 
     # Filtrare doar anunțuri din Chișinău și cu offer = 'sell'
     chisinau_city_id = "a36a231f-a54e-43e3-8c72-2c9204bc9a59"
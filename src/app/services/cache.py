@@ -8,11 +8,12 @@ This module provides:
 """
 
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from threading import Lock
 import asyncio
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -20,22 +21,30 @@ from apscheduler.triggers.interval import IntervalTrigger
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class CachedMarketData:
     """Cached market statistics data."""
     data: Dict[str, Any]
     timestamp: datetime
     source: str
     is_stale: bool = False
+    # monotonic creation time; ages are int arithmetic, immune to wall-clock jumps
+    created_ns: int = field(default_factory=time.monotonic_ns)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def age_seconds(self, now_ns: Optional[int] = None) -> float:
+        """Seconds since the entry was created; `now_ns` lets callers reuse a clock reading."""
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        return (now_ns - self.created_ns) * 1e-9
+    
+    def to_dict(self, now_ns: Optional[int] = None) -> Dict[str, Any]:
         """Convert to dictionary."""
         result = self.data.copy()
         result['cache_info'] = {
             'timestamp': self.timestamp.isoformat(),
             'source': self.source,
             'is_stale': self.is_stale,
-            'age_seconds': (datetime.now() - self.timestamp).total_seconds()
+            'age_seconds': self.age_seconds(now_ns)
         }
         return result
 
@@ -56,9 +65,15 @@ class MarketDataCache:
         """
         self._cache: Dict[str, CachedMarketData] = {}
         self._lock = Lock()
-        self.default_ttl = timedelta(minutes=default_ttl_minutes)
+        # Integer nanoseconds, compared directly against monotonic_ns() ages
+        self._ttl_ns = default_ttl_minutes * 60 * 1_000_000_000
         logger.info(f"MarketDataCache initialized with TTL={default_ttl_minutes} minutes")
     
+    @property
+    def default_ttl(self) -> timedelta:
+        """Default TTL for cache entries, derived from the nanosecond TTL."""
+        return timedelta(microseconds=self._ttl_ns / 1000)
+    
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """
         Get cached data by key.
@@ -77,14 +92,15 @@ class MarketDataCache:
                 return None
             
             # Check if expired
-            age = datetime.now() - cached.timestamp
-            if age > self.default_ttl:
-                logger.info(f"Cache EXPIRED for key: {key} (age: {age.total_seconds():.1f}s)")
+            now_ns = time.monotonic_ns()
+            age_ns = now_ns - cached.created_ns
+            if age_ns > self._ttl_ns:
+                logger.info(f"Cache EXPIRED for key: {key} (age: {age_ns * 1e-9:.1f}s)")
                 cached.is_stale = True
-                return cached.to_dict()  # Return stale data with flag
+                return cached.to_dict(now_ns)  # Return stale data with flag
             
-            logger.debug(f"Cache HIT for key: {key} (age: {age.total_seconds():.1f}s)")
-            return cached.to_dict()
+            logger.debug(f"Cache HIT for key: {key} (age: {age_ns * 1e-9:.1f}s)")
+            return cached.to_dict(now_ns)
     
     def set(self, key: str, data: Dict[str, Any], source: str = "unknown"):
         """
@@ -113,8 +129,7 @@ class MarketDataCache:
             key: Cache key to invalidate
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+            if self._cache.pop(key, None) is not None:
                 logger.info(f"Cache INVALIDATED for key: {key}")
     
     def clear(self):
@@ -132,15 +147,16 @@ class MarketDataCache:
                 'entries': {}
             }
             
+            now_ns = time.monotonic_ns()
             for key, cached in self._cache.items():
-                age = datetime.now() - cached.timestamp
-                is_expired = age > self.default_ttl
+                age_ns = now_ns - cached.created_ns
+                age_seconds = age_ns * 1e-9
                 
                 stats['entries'][key] = {
                     'timestamp': cached.timestamp.isoformat(),
-                    'age_seconds': age.total_seconds(),
-                    'age_minutes': age.total_seconds() / 60,
-                    'is_expired': is_expired,
+                    'age_seconds': age_seconds,
+                    'age_minutes': age_seconds / 60,
+                    'is_expired': age_ns > self._ttl_ns,
                     'is_stale': cached.is_stale,
                     'source': cached.source
                 }
@@ -249,8 +265,8 @@ class MarketDataScheduler:
             try:
                 from app.services.proimobil_api_service import get_detailed_proimobil_api_listings
 
-                # Refresh stats
-                proimobil_stats = compute_proimobil_api_stats(max_items=1000)
+                # Refresh stats (fresh fetch; the listings below reuse it)
+                proimobil_stats = compute_proimobil_api_stats(max_items=1000, use_cache=False)
                 self.cache.set('proimobil_api', asdict(proimobil_stats), source='scheduler')
                 logger.info(f"✓ Proimobil API stats: {proimobil_stats.total_ads} ads")
 
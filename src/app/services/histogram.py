@@ -1,5 +1,6 @@
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import List, Optional, Iterable
+from typing import List, Optional, Iterable, Tuple
 
 @dataclass
 class HistogramBin:
@@ -20,33 +21,53 @@ PRICE_INTERVALS = [
     (3500, None, ">3500"),
 ]
 
-def build_price_histogram(prices: Iterable[float]) -> List[HistogramBin]:
-    prices_list = list(p for p in prices if p is not None)
+# Intervals are contiguous, so bin edges are just the interval starts
+_INTERVAL_STARTS = [start for start, _, _ in PRICE_INTERVALS]
+
+def _histogram_counts(prices: Iterable[float], presorted: bool = False) -> Tuple[List[int], int]:
+    """Per-interval counts and the number of binned prices ([], 0 when there are none)."""
+    # ascending, None-free list: bin counts are differences of bisect positions;
+    # sorting in C beats a per-price bisect loop in Python
+    prices_list = prices if presorted else sorted(p for p in prices if p is not None)
     if not prices_list:
-        return []
+        return [], 0
     total = len(prices_list)
-    bins: List[HistogramBin] = []
-    for start, end, label in PRICE_INTERVALS:
-        if end is None:
-            count = sum(1 for p in prices_list if p >= start)
-        else:
-            count = sum(1 for p in prices_list if start <= p < end)
-        percentage = round((count / total) * 100, 1) if total else 0.0
-        bins.append(HistogramBin(start=start, end=end, count=count, percentage=percentage, label=label))
-    return bins
+    positions = [bisect_left(prices_list, start) for start in _INTERVAL_STARTS]
+    positions.append(total)
+    return [hi - lo for lo, hi in zip(positions, positions[1:])], total
+
+def build_price_histogram_with_dominant(
+    prices: Iterable[float], presorted: bool = False
+) -> Tuple[List[HistogramBin], Optional[HistogramBin]]:
+    """Histogram bins plus the most populated bin (first on ties), from one count pass."""
+    counts, total = _histogram_counts(prices, presorted=presorted)
+    if not total:
+        return [], None
+    bins = [
+        HistogramBin(start=start, end=end, count=count, percentage=round((count / total) * 100, 1), label=label)
+        for (start, end, label), count in zip(PRICE_INTERVALS, counts)
+    ]
+    dominant = bins[counts.index(max(counts))]
+    return bins, dominant
+
+def build_price_histogram(prices: Iterable[float], presorted: bool = False) -> List[HistogramBin]:
+    return build_price_histogram_with_dominant(prices, presorted=presorted)[0]
 
-def get_price_distribution_summary(prices: Iterable[float]) -> dict:
-    prices_list = list(prices)
-    bins = build_price_histogram(prices_list)
-    if not bins:
+def get_price_distribution_summary(prices: Iterable[float], presorted: bool = False) -> dict:
+    prices_list = prices if presorted else list(prices)
+    # empty input skips the binning pass; all-None input still yields no bins
+    counts, total = _histogram_counts(prices_list, presorted=presorted) if prices_list else ([], 0)
+    if not total:
         return {"total_ads": 0, "histogram": [], "dominant_range": None, "dominant_percentage": 0.0}
-    dominant = max(bins, key=lambda b: b.count)
+    # dicts are built straight from the counts, without intermediate HistogramBin objects
+    histogram = [
+        {"start": start, "end": end, "count": count, "percentage": round((count / total) * 100, 1), "label": label}
+        for (start, end, label), count in zip(PRICE_INTERVALS, counts)
+    ]
+    dominant = histogram[counts.index(max(counts))]
     return {
         "total_ads": len(prices_list),
-        "histogram": [
-            {"start": b.start, "end": b.end, "count": b.count, "percentage": b.percentage, "label": b.label}
-            for b in bins
-        ],
-        "dominant_range": dominant.label,
-        "dominant_percentage": dominant.percentage,
+        "histogram": histogram,
+        "dominant_range": dominant["label"],
+        "dominant_percentage": dominant["percentage"],
     }
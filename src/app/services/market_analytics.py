@@ -7,10 +7,26 @@ import logging
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict, Counter
+from bisect import bisect_right
+from functools import cached_property, lru_cache
+from operator import itemgetter
+import heapq
 import statistics
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (exclusive) of the price buckets used by _calculate_price_ranges
+_PRICE_RANGE_EDGES = (50000, 70000, 90000, 120000)
+_PRICE_RANGE_KEYS = ('under_50k', '50k_70k', '70k_90k', '90k_120k', 'over_120k')
+
+# Lower bounds (inclusive) of the overall score for each value assessment label
+_VALUE_THRESHOLDS = (50.0, 70.0, 85.0)
+_VALUE_LABELS = ('poor', 'fair', 'good', 'excellent')
+
+# Listing fields read by analyze_market; equal snapshots give equal insights
+_ANALYZED_FIELDS = ('price_eur', 'price_per_sqm', 'surface_sqm', 'sector', 'rooms')
+_MISSING = object()
+
 
 @dataclass
 class MarketInsights:
@@ -44,6 +60,14 @@ class MarketInsights:
     # Investment insights
     best_value_sectors: List[Tuple[str, float]]  # sector, avg €/m²
     emerging_areas: List[str]
+    
+    @cached_property
+    def sector_volume_score(self) -> Dict[str, float]:
+        """Location score per sector, computed once per instance.
+        
+        Not a dataclass field, so it stays out of asdict() and the API payload.
+        """
+        return _sector_volume_scores(self.sector_stats, self.total_listings)
 
 
 @dataclass
@@ -78,45 +102,38 @@ def analyze_market(listings: List[Dict[str, Any]]) -> MarketInsights:
     prices_per_sqm = [l['price_per_sqm'] for l in listings if l['price_per_sqm'] > 0]
     surfaces = [l['surface_sqm'] for l in listings if l['surface_sqm'] > 0]
     
-    # Sector analysis
-    sector_data = defaultdict(lambda: {'prices': [], 'surfaces': [], 'count': 0})
+    # Sector analysis (running sums; no per-sector value lists)
+    sector_data = defaultdict(lambda: {
+        'count': 0, 'sum_price': 0, 'sum_surface': 0,
+        'min_price': float('inf'), 'max_price': float('-inf'),
+    })
     for listing in listings:
-        sector = listing.get('sector', 'Unknown')
-        sector_data[sector]['prices'].append(listing['price_eur'])
-        sector_data[sector]['surfaces'].append(listing['surface_sqm'])
-        sector_data[sector]['count'] += 1
+        price = listing['price_eur']
+        data = sector_data[listing.get('sector', 'Unknown')]
+        data['count'] += 1
+        data['sum_price'] += price
+        data['sum_surface'] += listing['surface_sqm']
+        data['min_price'] = min(data['min_price'], price)
+        data['max_price'] = max(data['max_price'], price)
     
     sector_stats = {}
     for sector, data in sector_data.items():
-        if data['count'] > 0:
-            avg_price = statistics.mean(data['prices'])
-            avg_surface = statistics.mean(data['surfaces']) if data['surfaces'] else 0
-            avg_price_sqm = avg_price / avg_surface if avg_surface > 0 else 0
-            
-            sector_stats[sector] = {
-                'count': data['count'],
-                'avg_price_eur': round(avg_price, 2),
-                'avg_surface_sqm': round(avg_surface, 2),
-                'avg_price_per_sqm': round(avg_price_sqm, 2),
-                'min_price': min(data['prices']),
-                'max_price': max(data['prices'])
-            }
-    
-    # Top sectors
-    top_sectors_by_volume = sorted(
-        [(s, stats['count']) for s, stats in sector_stats.items()],
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
-    
-    top_sectors_by_price = sorted(
-        [(s, stats['avg_price_per_sqm']) for s, stats in sector_stats.items()],
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
-    
-    # Room distribution
-    room_counts = Counter(l['rooms'] for l in listings if l.get('rooms'))
+        count = data['count']
+        sum_surface = data['sum_surface']
+        # mean price / mean surface == total price / total surface
+        avg_price_sqm = data['sum_price'] / sum_surface if sum_surface > 0 else 0
+        
+        sector_stats[sector] = {
+            'count': count,
+            'avg_price_eur': round(data['sum_price'] / count, 2),
+            'avg_surface_sqm': round(sum_surface / count, 2),
+            'avg_price_per_sqm': round(avg_price_sqm, 2),
+            'min_price': data['min_price'],
+            'max_price': data['max_price']
+        }
+    
+    # Room distribution (one dict lookup per listing; Counter counts a list in C)
+    room_counts = Counter([rooms for l in listings if (rooms := l.get('rooms'))])
     most_common_rooms = room_counts.most_common(1)[0][0] if room_counts else 2
     
     # Price ranges
@@ -128,32 +145,39 @@ def analyze_market(listings: List[Dict[str, Any]]) -> MarketInsights:
     overpriced_count = sum(1 for p in prices_per_sqm if p > median_price_sqm * 1.15)
     fair_priced_count = total_listings - underpriced_count - overpriced_count
     
-    # Premium features (sectors with above average prices)
+    # Sector rankings and filters, collected in a single pass over sector_stats:
+    # - premium features: sectors with above average prices
+    # - budget indicators: sectors with below average prices
+    # - best value: good size, reasonable price
+    # - emerging areas: moderate prices, good volume
     avg_price_sqm = statistics.mean(prices_per_sqm) if prices_per_sqm else 0
-    premium_features = [
-        s for s, stats in sector_stats.items()
-        if stats['avg_price_per_sqm'] > avg_price_sqm * 1.1
-    ][:5]
-    
-    # Budget indicators
-    budget_indicators = [
-        s for s, stats in sector_stats.items()
-        if stats['avg_price_per_sqm'] < avg_price_sqm * 0.9
-    ][:5]
-    
-    # Best value sectors (good size, reasonable price)
-    best_value = sorted(
-        [(s, stats['avg_price_per_sqm']) for s, stats in sector_stats.items()
-         if stats['avg_surface_sqm'] >= 45 and stats['count'] >= 3],
-        key=lambda x: x[1]
-    )[:5]
-    
-    # Emerging areas (moderate prices, good volume)
-    emerging = [
-        s for s, stats in sector_stats.items()
-        if stats['count'] >= 5 and 
-        avg_price_sqm * 0.9 <= stats['avg_price_per_sqm'] <= avg_price_sqm * 1.1
-    ][:3]
+    premium_threshold = avg_price_sqm * 1.1
+    budget_threshold = avg_price_sqm * 0.9
+    
+    by_volume = []
+    by_price = []
+    premium_features = []
+    budget_indicators = []
+    best_value_candidates = []
+    emerging = []
+    for s, stats in sector_stats.items():
+        count = stats['count']
+        price_sqm = stats['avg_price_per_sqm']
+        by_volume.append((s, count))
+        by_price.append((s, price_sqm))
+        if price_sqm > premium_threshold:
+            premium_features.append(s)
+        if price_sqm < budget_threshold:
+            budget_indicators.append(s)
+        if stats['avg_surface_sqm'] >= 45 and count >= 3:
+            best_value_candidates.append((s, price_sqm))
+        if count >= 5 and budget_threshold <= price_sqm <= premium_threshold:
+            emerging.append(s)
+    
+    # Partial selection; same order as sorted(...)[:5], ties included
+    top_sectors_by_volume = heapq.nlargest(5, by_volume, key=itemgetter(1))
+    top_sectors_by_price = heapq.nlargest(5, by_price, key=itemgetter(1))
+    best_value = heapq.nsmallest(5, best_value_candidates, key=itemgetter(1))
     
     return MarketInsights(
         total_listings=total_listings,
@@ -171,11 +195,40 @@ def analyze_market(listings: List[Dict[str, Any]]) -> MarketInsights:
         underpriced_count=underpriced_count,
         overpriced_count=overpriced_count,
         fair_priced_count=fair_priced_count,
-        premium_features=premium_features,
-        budget_indicators=budget_indicators,
+        premium_features=premium_features[:5],
+        budget_indicators=budget_indicators[:5],
         best_value_sectors=best_value,
-        emerging_areas=emerging
+        emerging_areas=emerging[:3]
+    )
+
+
+def analyze_market_cached(listings: List[Dict[str, Any]]) -> MarketInsights:
+    """
+    Memoized analyze_market for repeated calls on the same listings snapshot.
+    
+    The cache key covers only the fields analyze_market reads, so listings
+    that differ elsewhere still share an entry. The returned MarketInsights
+    is shared between callers and must not be mutated.
+    
+    Args:
+        listings: List of property dictionaries from proimobil API
+        
+    Returns:
+        MarketInsights with detailed analytics
+    """
+    snapshot = tuple(
+        tuple(l.get(f, _MISSING) for f in _ANALYZED_FIELDS)
+        for l in listings
     )
+    return _analyze_market_snapshot(snapshot)
+
+
+@lru_cache(maxsize=8)
+def _analyze_market_snapshot(snapshot: Tuple[Tuple[Any, ...], ...]) -> MarketInsights:
+    return analyze_market([
+        {f: v for f, v in zip(_ANALYZED_FIELDS, row) if v is not _MISSING}
+        for row in snapshot
+    ])
 
 
 def score_property(
@@ -192,86 +245,103 @@ def score_property(
     Returns:
         PropertyScore with detailed scoring
     """
-    listing_id = listing.get('url_slug', listing.get('id', 'unknown'))
-    price = listing['price_eur']
-    surface = listing['surface_sqm']
-    price_per_sqm = listing['price_per_sqm']
-    sector = listing.get('sector', 'Unknown')
-    rooms = listing.get('rooms', 2)
-    
-    # Price score (0-100): How good is the price vs market
-    median_price_sqm = market_insights.median_price_per_sqm
-    if price_per_sqm <= median_price_sqm * 0.85:
-        price_score = 100  # Excellent deal
-    elif price_per_sqm <= median_price_sqm:
-        price_score = 85
-    elif price_per_sqm <= median_price_sqm * 1.1:
-        price_score = 70
-    elif price_per_sqm <= median_price_sqm * 1.2:
-        price_score = 50
-    else:
-        price_score = 30  # Overpriced
-    
-    # Location score (0-100): Based on sector popularity and price
-    sector_stats = market_insights.sector_stats.get(sector)
-    if sector_stats:
-        # High volume + reasonable price = good location
-        volume_score = min(100, (sector_stats['count'] / market_insights.total_listings) * 500)
-        location_score = volume_score
-    else:
-        location_score = 50  # Unknown sector
+    return score_properties([listing], market_insights)[0]
+
+
+def score_properties(
+    listings: List[Dict[str, Any]],
+    market_insights: MarketInsights
+) -> List[PropertyScore]:
+    """
+    Score a batch of properties against the same market insights.
     
-    # Size score (0-100): How optimal is the size for the room count
-    ideal_surface_per_room = 25  # ~25 sqm per room is ideal
-    if rooms > 0:
-        actual_surface_per_room = surface / rooms
-        size_ratio = actual_surface_per_room / ideal_surface_per_room
-        if 0.8 <= size_ratio <= 1.2:
-            size_score = 100
-        elif 0.6 <= size_ratio <= 1.4:
-            size_score = 80
-        else:
-            size_score = 60
-    else:
-        size_score = 70
+    Market-wide thresholds are computed once for the whole batch instead
+    of once per listing.
     
-    # Overall score (weighted average)
-    overall_score = (
-        price_score * 0.5 +  # Price is most important
-        location_score * 0.3 +
-        size_score * 0.2
-    )
+    Args:
+        listings: Property listing dictionaries
+        market_insights: Market insights for comparison
+        
+    Returns:
+        PropertyScore for each listing, in input order
+    """
+    median_price_sqm = market_insights.median_price_per_sqm
+    sector_volume_score = market_insights.sector_volume_score
     
-    # Value assessment
-    if overall_score >= 85:
-        value_assessment = "excellent"
-    elif overall_score >= 70:
-        value_assessment = "good"
-    elif overall_score >= 50:
-        value_assessment = "fair"
-    else:
-        value_assessment = "poor"
+    # Price score brackets vs the market median
+    excellent_price = median_price_sqm * 0.85
+    high_price = median_price_sqm * 1.1
+    overpriced_price = median_price_sqm * 1.2
     
-    # Predicted price range (±10% confidence interval)
-    predicted_price = median_price_sqm * surface
-    predicted_range = (
-        round(predicted_price * 0.9, 2),
-        round(predicted_price * 1.1, 2)
-    )
+    ideal_surface_per_room = 25  # ~25 sqm per room is ideal
     
-    # Vs market percentage
-    vs_market = ((price_per_sqm - median_price_sqm) / median_price_sqm) * 100
-    
-    return PropertyScore(
-        listing_id=listing_id,
-        price_score=round(price_score, 1),
-        location_score=round(location_score, 1),
-        size_score=round(size_score, 1),
-        overall_score=round(overall_score, 1),
-        value_assessment=value_assessment,
-        predicted_price_range=predicted_range,
-        vs_market_percentage=round(vs_market, 1)
-    )
+    scores = []
+    for listing in listings:
+        listing_id = listing.get('url_slug', listing.get('id', 'unknown'))
+        surface = listing['surface_sqm']
+        price_per_sqm = listing['price_per_sqm']
+        sector = listing.get('sector', 'Unknown')
+        rooms = listing.get('rooms', 2)
+        
+        # Price score (0-100): How good is the price vs market
+        if price_per_sqm <= excellent_price:
+            price_score = 100  # Excellent deal
+        elif price_per_sqm <= median_price_sqm:
+            price_score = 85
+        elif price_per_sqm <= high_price:
+            price_score = 70
+        elif price_per_sqm <= overpriced_price:
+            price_score = 50
+        else:
+            price_score = 30  # Overpriced
+        
+        # Location score (0-100): Based on sector popularity, 50 for unknown sectors
+        location_score = sector_volume_score.get(sector, 50)
+        
+        # Size score (0-100): How optimal is the size for the room count
+        if rooms > 0:
+            size_ratio = (surface / rooms) / ideal_surface_per_room
+            if 0.8 <= size_ratio <= 1.2:
+                size_score = 100
+            elif 0.6 <= size_ratio <= 1.4:
+                size_score = 80
+            else:
+                size_score = 60
+        else:
+            size_score = 70
+        
+        # Overall score (weighted average)
+        overall_score = (
+            price_score * 0.5 +  # Price is most important
+            location_score * 0.3 +
+            size_score * 0.2
+        )
+        
+        # Value assessment
+        value_assessment = _VALUE_LABELS[bisect_right(_VALUE_THRESHOLDS, overall_score)]
+        
+        # Predicted price range (±10% confidence interval)
+        predicted_price = median_price_sqm * surface
+        predicted_range = (
+            round(predicted_price * 0.9, 2),
+            round(predicted_price * 1.1, 2)
+        )
+        
+        # Vs market percentage
+        vs_market = ((price_per_sqm - median_price_sqm) / median_price_sqm) * 100
+        
+        scores.append(PropertyScore(
+            listing_id=listing_id,
+            price_score=round(price_score, 1),
+            location_score=round(location_score, 1),
+            size_score=round(size_score, 1),
+            overall_score=round(overall_score, 1),
+            value_assessment=value_assessment,
+            predicted_price_range=predicted_range,
+            vs_market_percentage=round(vs_market, 1)
+        ))
+    
+    return scores
 
 
 def get_price_predictions(
@@ -361,11 +431,12 @@ def find_similar_properties(
     ref_surface = reference_listing['surface_sqm']
     ref_rooms = reference_listing.get('rooms', 2)
     ref_sector = reference_listing.get('sector', '')
+    ref_slug = reference_listing.get('url_slug')
     
-    similar = []
+    candidates = []
     
     for listing in all_listings:
-        if listing.get('url_slug') == reference_listing.get('url_slug'):
+        if listing.get('url_slug') == ref_slug:
             continue  # Skip self
         
         # Calculate similarity score
@@ -381,37 +452,31 @@ def find_similar_properties(
         )
         
         if similarity >= 40:  # Only include reasonably similar properties
-            similar.append({
-                **listing,
-                'similarity_score': round(similarity, 1)
-            })
-    
-    # Sort by similarity and return top N
-    similar.sort(key=lambda x: x['similarity_score'], reverse=True)
-    return similar[:limit]
+            candidates.append((round(similarity, 1), listing))
+    
+    # Select top N by similarity; only the winners are copied into result dicts
+    top = heapq.nlargest(limit, candidates, key=itemgetter(0))
+    return [
+        {**listing, 'similarity_score': score}
+        for score, listing in top
+    ]
+
+
+def _sector_volume_scores(
+    sector_stats: Dict[str, Dict[str, Any]],
+    total_listings: int
+) -> Dict[str, float]:
+    """Location score per sector: high volume = good location (0-100)."""
+    return {
+        sector: min(100, (stats['count'] / total_listings) * 500)
+        for sector, stats in sector_stats.items()
+    }
 
 
 def _calculate_price_ranges(prices: List[float]) -> Dict[str, int]:
     """Calculate distribution across price ranges."""
-    ranges = {
-        'under_50k': 0,
-        '50k_70k': 0,
-        '70k_90k': 0,
-        '90k_120k': 0,
-        'over_120k': 0
-    }
-    
+    counts = [0] * len(_PRICE_RANGE_KEYS)
     for price in prices:
-        if price < 50000:
-            ranges['under_50k'] += 1
-        elif price < 70000:
-            ranges['50k_70k'] += 1
-        elif price < 90000:
-            ranges['70k_90k'] += 1
-        elif price < 120000:
-            ranges['90k_120k'] += 1
-        else:
-            ranges['over_120k'] += 1
-    
-    return ranges
+        counts[bisect_right(_PRICE_RANGE_EDGES, price)] += 1
 
+    return dict(zip(_PRICE_RANGE_KEYS, counts))
@@ -4,23 +4,68 @@ Market service - aggregation and orchestration of market data.
 This service combines data from multiple scraping sources
 (Proimobil, Accesimobil, 999.md) to provide unified market insights.
 """
+import concurrent.futures
 import logging
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple
 from datetime import datetime
+from math import fsum, sqrt
+from statistics import fmean
 
 from app.domain.market_stats import MarketStats
 from app.scraping.proimobil import compute_proimobil_stats, fetch_all_proimobil_prices
 from app.scraping.accesimobil import compute_stats_for_accesimobil, fetch_all_prices_accesimobil
 from app.scraping.md999 import compute_999md_stats, fetch_all_999md_prices
 from app.services.cache import get_market_cache
+from app.services.quartile_analysis import median_of_sorted
 
 logger = logging.getLogger(__name__)
 
 
+def _fetch_source(source_name: str, fetch_func, use_cache: bool) -> Tuple[Optional[Dict[str, Any]], List[float]]:
+    """
+    Fetch one source's stats, going through the market cache.
+
+    Returns:
+        Tuple of (stats dict for the response, prices to aggregate)
+    """
+    try:
+        logger.info(f"Fetching {source_name} data...")
+
+        # Check cache first
+        cache = get_market_cache()
+        cache_key = f"market_{source_name}"
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached:
+                logger.info(f"Using cached {source_name} data")
+                return cached, cached.get("prices") or []
+
+        # Fetch fresh data
+        stats = fetch_func()
+        if not stats:
+            return None, []
+
+        stats_dict = stats.to_dict() if hasattr(stats, "to_dict") else stats
+
+        # Cache the result
+        if use_cache:
+            cache.set(cache_key, stats_dict, source=source_name)
+
+        # Collect prices for aggregation
+        prices = stats.prices if isinstance(stats, MarketStats) and stats.prices else []
+        return stats_dict, prices
+
+    except Exception as e:
+        logger.error(f"Error fetching {source_name} data: {e}")
+        return {"error": str(e)}, []
+
+
 def get_market_data_aggregated(use_cache: bool = True) -> Dict[str, Any]:
     """
     Fetch and aggregate market data from all sources.
 
+    Sources are independent and IO-bound, so they are fetched concurrently.
+
     Args:
         use_cache: Whether to use cached data
 
@@ -43,51 +88,29 @@ def get_market_data_aggregated(use_cache: bool = True) -> Dict[str, Any]:
 
     all_prices = []
 
-    for source_name, fetch_func in sources:
-        try:
-            logger.info(f"Fetching {source_name} data...")
-
-            # Check cache first
-            cache = get_market_cache()
-            cache_key = f"market_{source_name}"
-            if use_cache:
-                cached = cache.get(cache_key)
-                if cached:
-                    logger.info(f"Using cached {source_name} data")
-                    result["sources"][source_name] = cached
-                    if cached.get("prices"):
-                        all_prices.extend(cached["prices"])
-                    continue
-
-            # Fetch fresh data
-            stats = fetch_func()
-            if stats:
-                stats_dict = stats.to_dict() if hasattr(stats, "to_dict") else stats
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(sources)) as ex:
+        fetched = ex.map(lambda src: _fetch_source(src[0], src[1], use_cache), sources)
+        for (source_name, _), (stats_dict, prices) in zip(sources, fetched):
+            if stats_dict is not None:
                 result["sources"][source_name] = stats_dict
-
-                # Cache the result
-                if use_cache:
-                    cache.set(cache_key, stats_dict, source=source_name)
-
-                # Collect prices for aggregation
-                if isinstance(stats, MarketStats) and stats.prices:
-                    all_prices.extend(stats.prices)
-
-        except Exception as e:
-            logger.error(f"Error fetching {source_name} data: {e}")
-            result["sources"][source_name] = {"error": str(e)}
+            all_prices.extend(prices)
 
     # Calculate aggregate statistics if we have data
     if all_prices:
-        from statistics import mean, median, stdev
+        # One sort serves min/max/median; the deviation pass reuses the mean
+        sorted_prices = sorted(all_prices)
+        n = len(sorted_prices)
+        avg = fmean(sorted_prices)
+        median_price = median_of_sorted(sorted_prices)
+        std_dev = sqrt(fsum((p - avg) ** 2 for p in sorted_prices) / (n - 1)) if n > 1 else 0
 
         result["aggregate"] = {
-            "total_listings": len(all_prices),
-            "avg_price_per_sqm": mean(all_prices),
-            "median_price_per_sqm": median(all_prices),
-            "min_price_per_sqm": min(all_prices),
-            "max_price_per_sqm": max(all_prices),
-            "std_dev": stdev(all_prices) if len(all_prices) > 1 else 0,
+            "total_listings": n,
+            "avg_price_per_sqm": avg,
+            "median_price_per_sqm": median_price,
+            "min_price_per_sqm": sorted_prices[0],
+            "max_price_per_sqm": sorted_prices[-1],
+            "std_dev": std_dev,
             "currency": "EUR"
         }
 
@@ -1,35 +1,87 @@
 from datetime import datetime
 from pathlib import Path
+from functools import lru_cache
 from importlib import import_module
+import threading
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
-# Fallback HTML (WeasyPrint) or stub
-try:
-    from weasyprint import HTML as _WeasyHTML  # type: ignore
-except Exception:
-    class _WeasyHTML:  # type: ignore
-        def __init__(self, *args, **kwargs):
-            pass
-        def write_pdf(self):
-            return b"%PDF-STUB%"
+
+class _StubHTML:
+    def __init__(self, *args, **kwargs):
+        pass
+    def write_pdf(self, *args, **kwargs):
+        return b"%PDF-STUB%"
+
+
+@lru_cache(maxsize=1)
+def _weasyprint():
+    """WeasyPrint's HTML and FontConfiguration classes, imported on first use.
+
+    WeasyPrint pulls in Cairo/Pango, so it is kept out of app import time.
+    Falls back to a stub renderer when it is not installed.
+    """
+    try:
+        from weasyprint import HTML as WeasyHTML  # type: ignore
+        from weasyprint.text.fonts import FontConfiguration  # type: ignore
+    except Exception:
+        return _StubHTML, None
+    return WeasyHTML, FontConfiguration
+
+
+# A FontConfiguration is not safe to share between concurrent renders, so each
+# threadpool worker keeps its own and loads the @font-face fonts once
+_thread_fonts = threading.local()
+
+def _font_config(font_config_cls):
+    font_config = getattr(_thread_fonts, 'font_config', None)
+    if font_config is None:
+        font_config = _thread_fonts.font_config = font_config_cls()
+    return font_config
+
+
+class HTML:
+    """WeasyPrint HTML document, loading WeasyPrint on first construction."""
+
+    def __init__(self, *args, **kwargs):
+        html_cls, font_config_cls = _weasyprint()
+        self._font_config = _font_config(font_config_cls) if font_config_cls else None
+        self._document = html_cls(*args, **kwargs)
+
+    def write_pdf(self, *args, **kwargs):
+        kwargs.setdefault('font_config', self._font_config)
+        return self._document.write_pdf(*args, **kwargs)
 
 # Resolve templates directory (package root -> templates)
 PACKAGE_DIR = Path(__file__).resolve().parents[2]
 TEMPLATES_DIR = PACKAGE_DIR / 'templates'
 templates_env = Environment(
     loader=FileSystemLoader(str(TEMPLATES_DIR)),
-    autoescape=select_autoescape(['html', 'xml'])
+    autoescape=select_autoescape(['html', 'xml']),
+    auto_reload=False,  # templates ship with the package; skip per-render mtime checks
 )
 
+# Compiled once at import; renders reuse these Template objects directly
+_REPORT_TPL = templates_env.get_template('report.html')
+_SALE_SUMMARY_TPL = templates_env.get_template('sale_summary.html')
+
+# app.main, resolved lazily on first render (importing it eagerly would be circular)
+_main_module = None
+
 def _html_class():
-    """Return HTML class from main (monkeypatched in tests) or fallback."""
-    try:
-        main_module = import_module('app.main')
-        if hasattr(main_module, 'HTML'):
-            return getattr(main_module, 'HTML')
-    except Exception:
-        pass
-    return _WeasyHTML
+    """Return HTML class from main (monkeypatched in tests) or the lazy WeasyPrint one."""
+    global _main_module
+    if _main_module is None:
+        try:
+            _main_module = import_module('app.main')
+        except Exception:
+            return HTML
+    # attribute read stays per call so monkeypatching app.main.HTML keeps working
+    return getattr(_main_module, 'HTML', HTML)
+
+
+def _render_pdf(html_str: str) -> bytes:
+    HTMLCls = _html_class()
+    return HTMLCls(string=html_str, base_url=str(PACKAGE_DIR)).write_pdf()
 
 
 def generate_report_pdf(config: dict) -> bytes:
@@ -37,27 +89,23 @@ def generate_report_pdf(config: dict) -> bytes:
     result = calculate(config)
     if result.get('error'):
         raise ValueError(result.get('message', 'Calculation error'))
-    tpl = templates_env.get_template('report.html')
-    html_str = tpl.render(
+    html_str = _REPORT_TPL.render(
         config=config,
         r=result,
         generated_at=datetime.now().strftime('%Y-%m-%d %H:%M')
     )
-    HTMLCls = _html_class()
-    return HTMLCls(string=html_str, base_url=str(PACKAGE_DIR)).write_pdf()
+    return _render_pdf(html_str)
 
 
 def generate_sale_summary_pdf(config: dict, amount: float, currency: str) -> bytes:
     from app.domain.calc import calculate_sale_summary  # lazy import
     summary = calculate_sale_summary(config, amount, currency)
-    tpl = templates_env.get_template('sale_summary.html')
-    html_str = tpl.render(
+    html_str = _SALE_SUMMARY_TPL.render(
         config=config,
         summary=summary,
         currency=currency,
         generated_at=datetime.now().strftime('%Y-%m-%d %H:%M')
     )
-    HTMLCls = _html_class()
-    return HTMLCls(string=html_str, base_url=str(PACKAGE_DIR)).write_pdf()
+    return _render_pdf(html_str)
 
 __all__ = ["generate_report_pdf", "generate_sale_summary_pdf", "templates_env", "TEMPLATES_DIR"]
@@ -2,8 +2,7 @@ from __future__ import annotations
 
 from collections import defaultdict
 from datetime import datetime, timezone
-from statistics import median
-from typing import Iterable, Dict, List
+from typing import Dict, List
 
 from app.domain.proimobil_models import (
     ProimobilListing,
@@ -13,14 +12,10 @@ from app.domain.proimobil_models import (
     TimeOnMarketByGroup,
     ProimobilAnalytics,
 )
+from app.services.quartile_analysis import median_of_sorted
 
 
-def _compute_time_on_market(listings: Iterable[ProimobilListing]) -> TimeOnMarketStats:
-    today = datetime.now(timezone.utc)
-    days_list: List[int] = [
-        max((today - l.created_at).days, 0) for l in listings
-    ]
-
+def _time_on_market_stats(days_list: List[int]) -> TimeOnMarketStats:
     if not days_list:
         return TimeOnMarketStats(
             avg_days=0, median_days=0, p75_days=0, max_days=0
@@ -32,105 +27,79 @@ def _compute_time_on_market(listings: Iterable[ProimobilListing]) -> TimeOnMarke
 
     return TimeOnMarketStats(
         avg_days=sum(days_list) / n,
-        median_days=float(median(days_list)),
+        median_days=float(median_of_sorted(days_list)),
         p75_days=float(days_list[p75_idx]),
         max_days=days_list[-1],
     )
 
 
-def _compute_time_on_market_by_group(
-    listings: Iterable[ProimobilListing],
-) -> TimeOnMarketByGroup:
-    today = datetime.now(timezone.utc)
-
-    def build_group(key_fn):
-        groups: Dict[str, List[int]] = defaultdict(list)
-        for l in listings:
-            key = key_fn(l)
-            if not key:
-                continue
-            days = max((today - l.created_at).days, 0)
-            groups[str(key)].append(days)
-
-        result: Dict[str, TimeOnMarketStats] = {}
-        for key, days in groups.items():
-            days.sort()
-            n = len(days)
-            p75_idx = int(0.75 * (n - 1))
-            result[key] = TimeOnMarketStats(
-                avg_days=sum(days) / n,
-                median_days=float(median(days)),
-                p75_days=float(days[p75_idx]),
-                max_days=days[-1],
-            )
-        return result
-
-    listings_list = list(listings)  # cso we can iterate multiple times
-
-    return TimeOnMarketByGroup(
-        by_sector=build_group(lambda l: l.sector),
-        by_state=build_group(lambda l: l.state),
-        by_condition=build_group(lambda l: l.condition),
-        by_rooms=build_group(lambda l: l.rooms),
-    )
-
-
-def _compute_reservations(listings: Iterable[ProimobilListing]) -> ReservationStats:
-    lst = list(listings)
-    total_booked = sum(1 for l in lst if l.booked)
-    total_sold = sum(1 for l in lst if l.deal)
-    avg_orders = sum(l.order for l in lst) / len(lst) if lst else 0.0
-    return ReservationStats(
-        total_booked=total_booked,
-        total_sold=total_sold,
-        avg_orders_per_listing=avg_orders,
-    )
-
-
-def _compute_engagement(listings: Iterable[ProimobilListing]) -> EngagementStats:
-    lst = list(listings)
-    if not lst:
-        return EngagementStats(
-            avg_views_per_listing=0.0,
-            views_per_day_avg=0.0,
-        )
-
-    today = datetime.now(timezone.utc)
-    total_views = sum(l.views for l in lst)
-    avg_views = total_views / len(lst)
-
-    # views / day (normalized by age of the ad)
-    views_per_day = []
-    for l in lst:
-        days = max((today - l.created_at).days, 1)
-        views_per_day.append(l.views / days)
-
-    return EngagementStats(
-        avg_views_per_listing=avg_views,
-        views_per_day_avg=sum(views_per_day) / len(views_per_day),
-    )
+def _group_time_on_market(groups: Dict[str, List[int]]) -> Dict[str, TimeOnMarketStats]:
+    return {key: _time_on_market_stats(days) for key, days in groups.items()}
 
 
 def compute_proimobil_analytics(
     listings: list[ProimobilListing],
 ) -> ProimobilAnalytics:
     total = len(listings)
-    base_time_stats = _compute_time_on_market(listings)
-    group_time_stats = _compute_time_on_market_by_group(listings)
-    reservations = _compute_reservations(listings)
-    engagement = _compute_engagement(listings)
+    today = datetime.now(timezone.utc)
 
-    hot_ratio = (sum(1 for l in listings if l.is_hot) / total) if total else 0.0
-    exclusive_ratio = (
-        sum(1 for l in listings if l.is_exclusive) / total
-    ) if total else 0.0
+    # ages are computed once, up front, and reused by every aggregate below
+    days_list: List[int] = [max((today - l.created_at).days, 0) for l in listings]
+
+    # single pass over the listings: every aggregate is accumulated here
+    by_sector: Dict[str, List[int]] = defaultdict(list)
+    by_state: Dict[str, List[int]] = defaultdict(list)
+    by_condition: Dict[str, List[int]] = defaultdict(list)
+    by_rooms: Dict[str, List[int]] = defaultdict(list)
+    total_booked = total_sold = total_orders = total_views = 0
+    hot_count = exclusive_count = 0
+    views_per_day_sum = 0.0
+
+    for l, days in zip(listings, days_list):
+        if l.sector:
+            by_sector[str(l.sector)].append(days)
+        if l.state:
+            by_state[str(l.state)].append(days)
+        if l.condition:
+            by_condition[str(l.condition)].append(days)
+        if l.rooms:
+            by_rooms[str(l.rooms)].append(days)
+
+        if l.booked:
+            total_booked += 1
+        if l.deal:
+            total_sold += 1
+        if l.is_hot:
+            hot_count += 1
+        if l.is_exclusive:
+            exclusive_count += 1
+        views = l.views
+        total_orders += l.order
+        total_views += views
+        # views / day (normalized by age of the ad)
+        views_per_day_sum += views / max(days, 1)
+
+    reservations = ReservationStats(
+        total_booked=total_booked,
+        total_sold=total_sold,
+        avg_orders_per_listing=total_orders / total if total else 0.0,
+    )
+    engagement = EngagementStats(
+        avg_views_per_listing=total_views / total if total else 0.0,
+        views_per_day_avg=views_per_day_sum / total if total else 0.0,
+    )
 
     return ProimobilAnalytics(
         total_listings=total,
-        time_on_market=base_time_stats,
+        time_on_market=_time_on_market_stats(days_list),
         reservations=reservations,
         engagement=engagement,
-        hot_offers_ratio=hot_ratio,
-        exclusive_ratio=exclusive_ratio,
-        time_on_market_by_group=group_time_stats,
+        hot_offers_ratio=hot_count / total if total else 0.0,
+        exclusive_ratio=exclusive_count / total if total else 0.0,
+        time_on_market_by_group=TimeOnMarketByGroup(
+            by_sector=_group_time_on_market(by_sector),
+            by_state=_group_time_on_market(by_state),
+            by_condition=_group_time_on_market(by_condition),
+            by_rooms=_group_time_on_market(by_rooms),
+        ),
     )
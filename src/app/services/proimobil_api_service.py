@@ -3,25 +3,125 @@ Service layer for proimobil REST API (direct API calls, no scraping).
 """
 
 import logging
+from dataclasses import replace
 from typing import Dict, Any, List
 from app.scraping.proimobil_api import (
+    ProimobilAPIListing,
     fetch_all_proimobil_api_listings
 )
-from app.services.histogram import build_price_histogram
+from app.services.cache import get_market_cache
+from app.services.histogram import build_price_histogram_with_dominant
 from app.services.quartile_analysis import calculate_quartiles
 from app.domain.market_stats import MarketStats
-from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
+
+_API_URL = "https://api.proimobil.md/v1/properties"
+
+# Returned when there is nothing to compute; MarketStats is not mutated by callers
+_EMPTY_STATS = MarketStats(
+    source="proimobil_api",
+    url=_API_URL,
+    total_ads=0,
+    min_price_per_sqm=0.0,
+    max_price_per_sqm=0.0,
+    avg_price_per_sqm=0.0,
+    median_price_per_sqm=0.0
+)
+
+# Market cache key prefix for fetched API listings, one entry per max_items
+_LISTINGS_CACHE_KEY = "proimobil_api_fetch"
+
+
+def _listing_to_dict(listing: ProimobilAPIListing) -> Dict[str, Any]:
+    """Plain, JSON-serializable form of an API listing, as returned to clients."""
+    return {
+        "id": listing.listing_id,
+        "offer": listing.offer,
+        "category": listing.category,
+        "status": listing.status,
+        "is_hot": listing.is_hot,
+        "is_exclusive": listing.is_exclusive,
+        "deal": listing.deal,
+        "booked": listing.booked,
+        "order": listing.order,
+        "views": listing.views,
+        "bathrooms": listing.bathrooms,
+        "bedrooms": listing.bedrooms,
+        "balcony": listing.balcony,
+        "state": listing.state,
+        "parking": listing.parking,
+        "price_eur": listing.price_eur,
+        "price_per_sqm": round(listing.price_per_sqm, 2),
+        "city": listing.city,
+        "city_id": listing.city_id,
+        "sector": listing.sector,
+        "street": listing.street,
+        "rooms": listing.rooms,
+        "surface_sqm": listing.surface_sqm,
+        "condition": listing.condition,
+        "floor": listing.floor,
+        "number_of_floors": listing.number_of_floors,
+        "updated_at": listing.updated_at.isoformat() if listing.updated_at else None,
+        "created_at": listing.created_at.isoformat() if listing.created_at else None,
+    }
+
+
+def _fetch_listings(max_items: int, use_cache: bool = True) -> List[Dict[str, Any]]:
+    """
+    Fetch proimobil API listings as plain dicts, reusing a fresh market cache
+    entry for the same max_items.
+
+    Stats and detailed listings share the entry, so TTL, invalidation and
+    /cache/clear all go through the market cache. Empty results are not
+    cached so a failed fetch is retried next call.
+    """
+    cache = get_market_cache()
+    key = f"{_LISTINGS_CACHE_KEY}_{max_items}"
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None and not cached['cache_info']['is_stale']:
+            return cached['listings']
+
+    listings = [_listing_to_dict(listing) for listing in fetch_all_proimobil_api_listings(max_items)]
+    if listings:
+        cache.set(key, {'listings': listings}, source='proimobil_api')
+    return listings
+
+
+def _empty_stats(total_ads: int = 0) -> MarketStats:
+    """Zero-valued stats; the shared stub unless listings were found."""
+    if total_ads == 0:
+        return _EMPTY_STATS
+    return replace(_EMPTY_STATS, total_ads=total_ads)
 
 
-def compute_proimobil_api_stats(max_items: int = None) -> MarketStats:
+def _summarize(sorted_prices: List[float]) -> Dict[str, float]:
+    """
+    Min, max, mean, median and quartiles of a sorted, non-empty price list,
+    all rounded to 2 decimals.
+
+    Min/max are the list ends and the median is Q2, so the only full pass
+    besides the quartile reads is the sum for the mean. Quartiles come back
+    rounded from calculate_quartiles and are not rounded again.
+    """
+    quartiles = calculate_quartiles(sorted_prices, presorted=True)
+    return {
+        'min': round(sorted_prices[0], 2),
+        'max': round(sorted_prices[-1], 2),
+        'avg': round(sum(sorted_prices) / len(sorted_prices), 2),
+        'median': quartiles['q2'],
+        **quartiles,
+    }
+
+
+def compute_proimobil_api_stats(max_items: int = None, use_cache: bool = True) -> MarketStats:
     """
     Compute market statistics from proimobil.md REST API.
 
     Args:
         max_items: Maximum number of items to fetch (uses 500 if None)
+        use_cache: Reuse listings still fresh in the market cache
 
     Returns:
         MarketStats object with computed statistics
@@ -33,76 +133,50 @@ def compute_proimobil_api_stats(max_items: int = None) -> MarketStats:
         logger.info(f"Computing proimobil API stats (max_items={max_items})")
 
         # Fetch all listings
-        listings = fetch_all_proimobil_api_listings(max_items)
-
-        if not listings:
-            logger.warning("No listings found from proimobil API")
-            return MarketStats(
-                source="proimobil_api",
-                url="https://api.proimobil.md/v1/properties",
-                total_ads=0,
-                min_price_per_sqm=0.0,
-                max_price_per_sqm=0.0,
-                avg_price_per_sqm=0.0,
-                median_price_per_sqm=0.0
-            )
+        listings = _fetch_listings(max_items, use_cache)
 
         # Extract prices per sqm
-        prices = [listing.price_per_sqm for listing in listings if listing.price_per_sqm > 0]
+        # Unrounded €/m², computed as ProimobilAPIListing does
+        prices = [
+            price for listing in listings
+            if listing['surface_sqm'] > 0 and (price := listing['price_eur'] / listing['surface_sqm']) > 0
+        ]
 
         if not prices:
-            logger.warning("No valid prices found from proimobil API listings")
-            return MarketStats(
-                source="proimobil_api",
-                url="https://api.proimobil.md/v1/properties",
-                total_ads=len(listings),
-                min_price_per_sqm=0.0,
-                max_price_per_sqm=0.0,
-                avg_price_per_sqm=0.0,
-                median_price_per_sqm=0.0
-            )
-
-        # Sort prices for statistics
-        sorted_prices = sorted(prices)
-
-        # Basic statistics
-        min_price = sorted_prices[0]
-        max_price = sorted_prices[-1]
-        avg_price = sum(sorted_prices) / len(sorted_prices)
-
-        # Median
-        n = len(sorted_prices)
-        if n % 2 == 0:
-            median_price = (sorted_prices[n // 2 - 1] + sorted_prices[n // 2]) / 2
-        else:
-            median_price = sorted_prices[n // 2]
-
-        # Compute histogram
-        histogram = build_price_histogram(sorted_prices)
-
-        # Find dominant range
-        dominant_bin = max(histogram, key=lambda b: b.count) if histogram else None
+            if listings:
+                logger.warning("No valid prices found from proimobil API listings")
+            else:
+                logger.warning("No listings found from proimobil API")
+            return _empty_stats(len(listings))
+
+        # Sort in place (the list is ours) for statistics
+        prices.sort()
+        sorted_prices = prices
+
+        summary = _summarize(sorted_prices)
+        avg_price = summary['avg']
+        median_price = summary['median']
+
+        # Compute histogram and its dominant range together
+        histogram, dominant_bin = build_price_histogram_with_dominant(sorted_prices, presorted=True)
         dominant_range = dominant_bin.label if dominant_bin else ""
         dominant_percentage = dominant_bin.percentage if dominant_bin else 0.0
 
-        # Compute quartiles
-        quartile_info = calculate_quartiles(sorted_prices)
-
         stats = MarketStats(
             source="proimobil_api",
-            url="https://api.proimobil.md/v1/properties",
+            url=_API_URL,
             total_ads=len(listings),
-            min_price_per_sqm=round(min_price, 2),
-            max_price_per_sqm=round(max_price, 2),
-            avg_price_per_sqm=round(avg_price, 2),
-            median_price_per_sqm=round(median_price, 2),
+            min_price_per_sqm=summary['min'],
+            max_price_per_sqm=summary['max'],
+            avg_price_per_sqm=avg_price,
+            median_price_per_sqm=median_price,
             price_histogram=histogram,
             dominant_range=dominant_range,
-            dominant_percentage=round(dominant_percentage, 1),
-            q1_price_per_sqm=round(quartile_info.get("q1", 0), 2),
-            q2_price_per_sqm=round(quartile_info.get("q2", median_price), 2),
-            q3_price_per_sqm=round(quartile_info.get("q3", 0), 2),
-            iqr_price_per_sqm=round(quartile_info.get("iqr", 0), 2)
+            dominant_percentage=dominant_percentage,  # bin percentages are already rounded
+            q1_price_per_sqm=summary['q1'],
+            q2_price_per_sqm=summary['q2'],
+            q3_price_per_sqm=summary['q3'],
+            iqr_price_per_sqm=summary['iqr']
         )
 
         logger.info(f"Proimobil API stats: {len(listings)} ads, "
@@ -112,23 +186,16 @@ def compute_proimobil_api_stats(max_items: int = None) -> MarketStats:
 
     except Exception as e:
         logger.error(f"Error computing proimobil API stats: {e}", exc_info=True)
-        return MarketStats(
-            source="proimobil_api",
-            url="https://api.proimobil.md/v1/properties",
-            total_ads=0,
-            min_price_per_sqm=0.0,
-            max_price_per_sqm=0.0,
-            avg_price_per_sqm=0.0,
-            median_price_per_sqm=0.0
-        )
+        return _empty_stats()
 
 
-def get_detailed_proimobil_api_listings(max_items: int = None) -> List[Dict[str, Any]]:
+def get_detailed_proimobil_api_listings(max_items: int = None, use_cache: bool = True) -> List[Dict[str, Any]]:
     """
     Get detailed listing information from proimobil REST API.
 
     Args:
         max_items: Maximum number of items to fetch
+        use_cache: Reuse listings still fresh in the market cache
 
     Returns:
         List of dictionaries with detailed listing info
@@ -136,38 +203,5 @@ def get_detailed_proimobil_api_listings(max_items: int = None) -> List[Dict[str,
     if max_items is None:
         max_items = 500
 
-    listings = fetch_all_proimobil_api_listings(max_items)
-
-    return [
-        {
-            "id": listing.listing_id,
-            "offer": listing.offer,
-            "category": listing.category,
-            "status": listing.status,
-            "is_hot": listing.is_hot,
-            "is_exclusive": listing.is_exclusive,
-            "deal": listing.deal,
-            "booked": listing.booked,
-            "order": listing.order,
-            "views": listing.views,
-            "bathrooms": listing.bathrooms,
-            "bedrooms": listing.bedrooms,
-            "balcony": listing.balcony,
-            "state": listing.state,
-            "parking": listing.parking,
-            "price_eur": listing.price_eur,
-            "price_per_sqm": round(listing.price_per_sqm, 2),
-            "city": listing.city,
-            "city_id": listing.city_id,
-            "sector": listing.sector,
-            "street": listing.street,
-            "rooms": listing.rooms,
-            "surface_sqm": listing.surface_sqm,
-            "condition": listing.condition,
-            "floor": listing.floor,
-            "number_of_floors": listing.number_of_floors,
-            "updated_at": listing.updated_at.isoformat() if listing.updated_at else None,
-            "created_at": listing.created_at.isoformat() if listing.created_at else None,
-        }
-        for listing in listings
-    ]
+    # Copies: the cached dicts are shared between callers
+    return [dict(listing) for listing in _fetch_listings(max_items, use_cache)]
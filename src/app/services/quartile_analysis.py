@@ -5,16 +5,50 @@ Provides functions to calculate quartiles (Q1, Q2, Q3) and IQR
 for eliminating outliers and understanding realistic price ranges.
 """
 
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Tuple
-import statistics
 
 
-def calculate_quartiles(prices: List[float]) -> Dict[str, float]:
+def median_of_sorted(sorted_values: List[float]) -> float:
+    """
+    Median of an already sorted list, read directly by index.
+    
+    Same result as statistics.median without re-checking the order of the data.
+    """
+    n = len(sorted_values)
+    if n == 0:
+        raise ValueError("no median for empty data")
+    mid = n // 2
+    if n % 2:
+        return sorted_values[mid]
+    return (sorted_values[mid - 1] + sorted_values[mid]) / 2
+
+
+def _quartiles_of_sorted(sorted_values: List[float]) -> Tuple[float, float, float]:
+    """
+    Q1, Q2, Q3 of sorted data (at least two points).
+    
+    Same interpolation as statistics.quantiles(n=4) with the default
+    'exclusive' method, read straight from the sorted list.
+    """
+    ld = len(sorted_values)
+    m = ld + 1
+    cuts = []
+    for i in (1, 2, 3):
+        j = i * m // 4
+        j = 1 if j < 1 else ld - 1 if j > ld - 1 else j
+        delta = i * m - j * 4
+        cuts.append((sorted_values[j - 1] * (4 - delta) + sorted_values[j] * delta) / 4)
+    return cuts[0], cuts[1], cuts[2]
+
+
+def calculate_quartiles(prices: List[float], presorted: bool = False) -> Dict[str, float]:
     """
     Calculate quartile statistics for a list of prices.
     
     Args:
         prices: List of price values (e.g., price per sqm)
+        presorted: Set when prices are already in ascending order to skip the sorted copy
         
     Returns:
         Dictionary containing:
@@ -39,7 +73,7 @@ def calculate_quartiles(prices: List[float]) -> Dict[str, float]:
         }
     
     if len(prices) == 1:
-        val = prices[0]
+        val = round(prices[0], 2)
         return {
             'q1': val,
             'q2': val,
@@ -47,17 +81,10 @@ def calculate_quartiles(prices: List[float]) -> Dict[str, float]:
             'iqr': 0.0,
         }
     
-    sorted_prices = sorted(prices)
+    sorted_prices = prices if presorted else sorted(prices)
     
-    # Using statistics.quantiles (available in Python 3.8+)
-    # quantiles(data, n=4) returns 3 cut points: Q1, Q2 (median), Q3
-    try:
-        q1, q2, q3 = statistics.quantiles(sorted_prices, n=4)
-    except statistics.StatisticsError:
-        # Fallback for edge cases
-        q1 = sorted_prices[len(sorted_prices) // 4]
-        q2 = statistics.median(sorted_prices)
-        q3 = sorted_prices[3 * len(sorted_prices) // 4]
+    # Cut points match statistics.quantiles(data, n=4); two or more points here
+    q1, q2, q3 = _quartiles_of_sorted(sorted_prices)
     
     iqr = q3 - q1
     
@@ -69,7 +96,9 @@ def calculate_quartiles(prices: List[float]) -> Dict[str, float]:
     }
 
 
-def remove_outliers_iqr(prices: List[float], factor: float = 1.5) -> Tuple[List[float], int]:
+def remove_outliers_iqr(
+    prices: List[float], factor: float = 1.5, presorted: bool = False
+) -> Tuple[List[float], int]:
     """
     Remove outliers using the IQR method.
     
@@ -81,6 +110,7 @@ def remove_outliers_iqr(prices: List[float], factor: float = 1.5) -> Tuple[List[
     Args:
         prices: List of price values
         factor: IQR multiplier for outlier detection (default: 1.5)
+        presorted: Set when prices are already in ascending order to skip the sorted copy
         
     Returns:
         Tuple of (filtered_prices, num_outliers_removed)
@@ -94,7 +124,8 @@ def remove_outliers_iqr(prices: List[float], factor: float = 1.5) -> Tuple[List[
     if len(prices) < 4:
         return prices, 0
     
-    quartiles = calculate_quartiles(prices)
+    sorted_prices = prices if presorted else sorted(prices)
+    quartiles = calculate_quartiles(sorted_prices, presorted=True)
     q1 = quartiles['q1']
     q3 = quartiles['q3']
     iqr = quartiles['iqr']
@@ -103,13 +134,36 @@ def remove_outliers_iqr(prices: List[float], factor: float = 1.5) -> Tuple[List[
     lower_bound = q1 - factor * iqr
     upper_bound = q3 + factor * iqr
     
-    # Filter prices
+    # Count outliers on the sorted copy; most inputs have none to filter out
+    num_removed = (
+        bisect_left(sorted_prices, lower_bound)
+        + len(sorted_prices) - bisect_right(sorted_prices, upper_bound)
+    )
+    if num_removed == 0:
+        return list(prices), 0
+    
+    # Filter prices (original order kept)
     filtered_prices = [p for p in prices if lower_bound <= p <= upper_bound]
-    num_removed = len(prices) - len(filtered_prices)
     
     return filtered_prices, num_removed
 
 
+# Labels for each band between consecutive _interpretation_thresholds
+_INTERPRETATION_LABELS = (
+    "below_market",  # Suspiciously low
+    "budget",  # Below Q1
+    "affordable",  # Q1 to median
+    "mid_range",  # Median to Q3
+    "premium",  # Just above Q3
+    "luxury",  # Well above Q3
+)
+
+
+def _interpretation_thresholds(q1: float, q3: float) -> Tuple[float, ...]:
+    """Ascending band boundaries; each is an exclusive upper bound of its label."""
+    return (q1 * 0.85, q1, (q1 + q3) / 2, q3, q3 * 1.15)
+
+
 def get_quartile_interpretation(price: float, q1: float, q3: float) -> str:
     """
     Get human-readable interpretation of where a price falls in the quartile range.
@@ -120,25 +174,36 @@ def get_quartile_interpretation(price: float, q1: float, q3: float) -> str:
         q3: Third quartile (75th percentile)
         
     Returns:
-        String description: "below_market", "affordable", "mid_range", "premium", "luxury"
+        String description: "below_market", "budget", "affordable", "mid_range", "premium", "luxury"
+    """
+    thresholds = _interpretation_thresholds(q1, q3)
+    return _INTERPRETATION_LABELS[bisect_right(thresholds, price)]
+
+
+def classify_prices(prices: List[float], q1: float, q3: float) -> List[str]:
+    """
+    Interpret many prices against the same quartiles.
+    
+    Thresholds are computed once for the whole batch; each price is then a
+    single bisect. Labels match get_quartile_interpretation.
+    
+    Args:
+        prices: Prices to interpret
+        q1: First quartile (25th percentile)
+        q3: Third quartile (75th percentile)
+        
+    Returns:
+        One label per price, in input order
     """
-    if price < q1 * 0.85:
-        return "below_market"  # Suspiciously low
-    elif price < q1:
-        return "budget"  # Below Q1
-    elif price < (q1 + q3) / 2:
-        return "affordable"  # Q1 to median
-    elif price < q3:
-        return "mid_range"  # Median to Q3
-    elif price < q3 * 1.15:
-        return "premium"  # Just above Q3
-    else:
-        return "luxury"  # Well above Q3
+    thresholds = _interpretation_thresholds(q1, q3)
+    labels = _INTERPRETATION_LABELS
+    return [labels[bisect_right(thresholds, price)] for price in prices]
 
 
 __all__ = [
     'calculate_quartiles',
     'remove_outliers_iqr',
     'get_quartile_interpretation',
+    'classify_prices',
 ]
 
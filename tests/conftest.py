@@ -0,0 +1,63 @@
+"""
+Shared pytest fixtures.
+
+The FastAPI app is imported inside fixtures so that test modules which never
+touch it (e.g. test_calc.py) don't pay for booting the application.
+"""
+import sys
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def settings():
+    """The cached application Settings instance."""
+    from app.core.config import get_settings
+    return get_settings()
+
+
+@pytest.fixture(scope="session")
+def main_module():
+    """The app.main module, for tests that patch its attributes."""
+    import app.main
+    return app.main
+
+
+@pytest.fixture(scope="session")
+def app(main_module):
+    return main_module.app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Single TestClient shared across test modules.
+
+    Not entered as a context manager: the app lifespan would start the
+    background scraping scheduler. Under pytest-xdist every worker is its
+    own process, so each one gets its own client.
+    """
+    from fastapi.testclient import TestClient
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def isolate_module_caches():
+    """Snapshot and restore the module-level rates and market summary caches.
+
+    Never imports anything itself: a module that is not loaded yet is restored
+    to its freshly imported (empty) state if the test ends up importing it.
+    """
+    main = sys.modules.get("app.main")
+    rates_utils = sys.modules.get("app.domain.rates_utils")
+    summary, summary_ts = (main._market_summary_cache, main._market_summary_cache_ts) if main else (None, None)
+    rates, rates_ts = (dict(rates_utils._RATES_CACHE), rates_utils._RATES_CACHE_TS) if rates_utils else ({}, None)
+    yield
+    main = sys.modules.get("app.main")
+    rates_utils = sys.modules.get("app.domain.rates_utils")
+    if main is not None:
+        main._market_summary_cache = summary
+        main._market_summary_cache_ts = summary_ts
+    if rates_utils is not None:
+        rates_utils._RATES_CACHE.clear()
+        rates_utils._RATES_CACHE.update(rates)
+        rates_utils._RATES_CACHE_TS = rates_ts
@@ -301,3 +301,147 @@ def test_sector_stats_structure(client: TestClient):
         assert sector_data["count"] > 0
         assert sector_data["avg_price_eur"] > 0
         assert sector_data["min_price"] <= sector_data["max_price"]
+
+
+def test_calculate_price_ranges_bucket_edges():
+    """Bucket edges are exclusive upper bounds."""
+    from app.services.market_analytics import _calculate_price_ranges
+
+    ranges = _calculate_price_ranges([49999, 50000, 69999, 70000, 90000, 119999, 120000, 250000])
+    assert ranges == {
+        'under_50k': 1,
+        '50k_70k': 2,
+        '70k_90k': 1,
+        '90k_120k': 2,
+        'over_120k': 2,
+    }
+    assert _calculate_price_ranges([]) == dict.fromkeys(ranges, 0)
+
+
+def test_find_similar_properties_ranking():
+    """Similar properties are ranked by score, skip the reference and honour the limit."""
+    from app.services.market_analytics import find_similar_properties
+
+    reference = {'url_slug': 'ref', 'surface_sqm': 50, 'rooms': 2, 'sector': 'Botanica'}
+    listings = [
+        reference,
+        {'url_slug': 'a', 'surface_sqm': 60, 'rooms': 2, 'sector': 'Botanica'},
+        {'url_slug': 'b', 'surface_sqm': 50, 'rooms': 2, 'sector': 'Botanica'},
+        {'url_slug': 'c', 'surface_sqm': 50, 'rooms': 3, 'sector': 'Centru'},
+        {'url_slug': 'd', 'surface_sqm': 200, 'rooms': 4, 'sector': 'Centru'},
+    ]
+
+    similar = find_similar_properties(reference, listings, limit=2)
+    assert [s['url_slug'] for s in similar] == ['b', 'a']
+    assert similar[0]['similarity_score'] == 100.0
+    assert similar[1]['similarity_score'] == 92.0
+
+    # 'd' scores below the 40 point threshold
+    all_similar = find_similar_properties(reference, listings, limit=10)
+    assert [s['url_slug'] for s in all_similar] == ['b', 'a', 'c']
+
+
+def test_score_properties_matches_single_scoring():
+    """Batch scoring returns the same scores as scoring listings one by one."""
+    from app.services.market_analytics import analyze_market, score_property, score_properties
+
+    listings = [
+        {'url_slug': f'l{i}', 'price_eur': price, 'surface_sqm': surface,
+         'price_per_sqm': price / surface, 'rooms': rooms, 'sector': sector}
+        for i, (price, surface, rooms, sector) in enumerate([
+            (45000, 40, 1, 'Botanica'),
+            (60000, 52, 2, 'Botanica'),
+            (75000, 55, 2, 'Centru'),
+            (120000, 80, 3, 'Centru'),
+            (52000, 48, 2, 'Ciocana'),
+        ])
+    ]
+    insights = analyze_market(listings)
+
+    batch = score_properties(listings, insights)
+    assert [s.listing_id for s in batch] == [l['url_slug'] for l in listings]
+    assert batch == [score_property(l, insights) for l in listings]
+    assert score_properties([], insights) == []
+
+
+def test_sector_volume_score_kept_out_of_serialized_insights():
+    """sector_volume_score is derived from sector_stats and never serialized."""
+    from dataclasses import asdict
+    from app.services.market_analytics import analyze_market, MarketInsights
+
+    listings = [
+        {'url_slug': f'l{i}', 'price_eur': 50000 + i * 1000, 'surface_sqm': 50,
+         'price_per_sqm': (50000 + i * 1000) / 50, 'rooms': 2,
+         'sector': 'Botanica' if i < 9 else 'Centru'}
+        for i in range(10)
+    ]
+    insights = analyze_market(listings)
+    assert insights.sector_volume_score == {'Botanica': 100, 'Centru': 50.0}
+
+    cached = asdict(insights)
+    assert 'sector_volume_score' not in cached
+    assert MarketInsights(**cached).sector_volume_score == insights.sector_volume_score
+
+
+def test_analyze_market_cached_reuses_snapshot():
+    """Equal listing snapshots share one MarketInsights; changed prices recompute."""
+    from app.services.market_analytics import analyze_market, analyze_market_cached
+
+    listings = [
+        {'url_slug': f'l{i}', 'price_eur': 50000 + i * 1000, 'surface_sqm': 50,
+         'price_per_sqm': (50000 + i * 1000) / 50, 'rooms': 2, 'sector': 'Botanica'}
+        for i in range(5)
+    ]
+    del listings[0]['sector']  # missing sector still maps to 'Unknown'
+
+    insights = analyze_market_cached(listings)
+    assert insights == analyze_market(listings)
+    assert analyze_market_cached([dict(l) for l in listings]) is insights
+
+    listings[1]['price_eur'] += 1000
+    assert analyze_market_cached(listings) is not insights
+
+
+def test_value_assessment_thresholds():
+    """Score thresholds are inclusive lower bounds of each label."""
+    from dataclasses import replace
+    from app.services.market_analytics import analyze_market, score_property, score_properties
+
+    base = [
+        {'url_slug': f'b{i}', 'price_eur': 50000, 'surface_sqm': 50, 'price_per_sqm': 1000,
+         'rooms': 2, 'sector': 'Centru'}
+        for i in range(3)
+    ]
+    # Location scores of 49/50/51 (count / total * 500) move the overall
+    # score by +/-0.3 around each threshold
+    insights = replace(
+        analyze_market(base),
+        median_price_per_sqm=1000.0,
+        total_listings=500,
+        sector_stats={'S49': {'count': 49}, 'S50': {'count': 50}, 'S51': {'count': 51}},
+    )
+
+    # 50 m2 for 2 rooms is the ideal size (size score 100); price sets the price score
+    cases = [
+        (1500, 'S49', 49.7, 'poor'),
+        (1500, 'S50', 50.0, 'fair'),
+        (1500, 'S51', 50.3, 'fair'),
+        (1050, 'S49', 69.7, 'fair'),
+        (1050, 'S50', 70.0, 'good'),
+        (1050, 'S51', 70.3, 'good'),
+        (800, 'S49', 84.7, 'good'),
+        (800, 'S50', 85.0, 'excellent'),
+        (800, 'S51', 85.3, 'excellent'),
+    ]
+    listings = [
+        {'url_slug': f'l{i}', 'price_eur': pps * 50, 'surface_sqm': 50, 'price_per_sqm': pps,
+         'rooms': 2, 'sector': sector}
+        for i, (pps, sector, _, _) in enumerate(cases)
+    ]
+
+    scores = score_properties(listings, insights)
+    assert [(s.overall_score, s.value_assessment) for s in scores] == [
+        (score, label) for _, _, score, label in cases
+    ]
+    assert score_property(listings[1], insights).value_assessment == 'fair'
+    assert score_property(listings[7], insights).value_assessment == 'excellent'
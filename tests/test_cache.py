@@ -3,16 +3,30 @@ Tests for cache functionality and cache router endpoints.
 """
 
 from datetime import datetime, timedelta
-from fastapi.testclient import TestClient
 
-from app.main import app
+import pytest
+
 from app.services.cache import (
     MarketDataCache,
     MarketDataScheduler,
     CachedMarketData
 )
 
-client = TestClient(app)
+
+@pytest.fixture
+def cache():
+    """Fresh cache with a 30 minute TTL."""
+    c = MarketDataCache(default_ttl_minutes=30)
+    yield c
+    c.clear()
+
+
+@pytest.fixture
+def expiring_cache():
+    """Cache whose entries are stale as soon as they are set."""
+    c = MarketDataCache(default_ttl_minutes=0)
+    yield c
+    c.clear()
 
 
 class TestMarketDataCache:
@@ -23,10 +37,8 @@ class TestMarketDataCache:
         cache = MarketDataCache(default_ttl_minutes=15)
         assert cache.default_ttl == timedelta(minutes=15)
     
-    def test_cache_set_and_get(self):
+    def test_cache_set_and_get(self, cache):
         """Test basic cache set and get operations."""
-        cache = MarketDataCache(default_ttl_minutes=30)
-        
         data = {"price": 1500, "total": 100}
         cache.set("test_key", data, source="test")
         
@@ -36,38 +48,31 @@ class TestMarketDataCache:
         assert result["total"] == 100
         assert "cache_info" in result
     
-    def test_cache_miss(self):
+    def test_cache_miss(self, cache):
         """Test cache returns None for missing key."""
-        cache = MarketDataCache(default_ttl_minutes=30)
         result = cache.get("non_existent_key")
         assert result is None
     
-    def test_cache_expiration(self):
+    def test_cache_expiration(self, expiring_cache):
         """Test cache marks data as stale after TTL."""
-        cache = MarketDataCache(default_ttl_minutes=0)  # Expire immediately
-        
         data = {"price": 1500}
-        cache.set("test_key", data, source="test")
+        expiring_cache.set("test_key", data, source="test")
         
         # Should return stale data
-        result = cache.get("test_key")
+        result = expiring_cache.get("test_key")
         assert result is not None
         assert result["cache_info"]["is_stale"] is True
     
-    def test_cache_invalidate(self):
+    def test_cache_invalidate(self, cache):
         """Test cache invalidation removes entry."""
-        cache = MarketDataCache(default_ttl_minutes=30)
-        
         cache.set("test_key", {"data": "value"}, source="test")
         assert cache.get("test_key") is not None
         
         cache.invalidate("test_key")
         assert cache.get("test_key") is None
     
-    def test_cache_clear(self):
+    def test_cache_clear(self, cache):
         """Test cache clear removes all entries."""
-        cache = MarketDataCache(default_ttl_minutes=30)
-        
         cache.set("key1", {"data": "value1"}, source="test")
         cache.set("key2", {"data": "value2"}, source="test")
         
@@ -76,10 +81,8 @@ class TestMarketDataCache:
         assert cache.get("key1") is None
         assert cache.get("key2") is None
     
-    def test_cache_stats(self):
+    def test_cache_stats(self, cache):
         """Test cache statistics."""
-        cache = MarketDataCache(default_ttl_minutes=30)
-        
         cache.set("key1", {"data": "value1"}, source="test")
         cache.set("key2", {"data": "value2"}, source="test")
         
@@ -94,7 +97,7 @@ class TestMarketDataCache:
 class TestCacheRouter:
     """Test cache router endpoints."""
     
-    def test_cache_status_endpoint(self):
+    def test_cache_status_endpoint(self, client):
         """Test GET /cache/status endpoint."""
         response = client.get("/cache/status")
         
@@ -106,7 +109,7 @@ class TestCacheRouter:
         assert "total_entries" in data["cache"]
         assert "is_running" in data["scheduler"]
     
-    def test_cache_clear_endpoint(self):
+    def test_cache_clear_endpoint(self, client):
         """Test POST /cache/clear endpoint."""
         response = client.post("/cache/clear")
         
@@ -116,7 +119,7 @@ class TestCacheRouter:
         assert data["success"] is True
         assert "message" in data
     
-    def test_cache_refresh_endpoint(self):
+    def test_cache_refresh_endpoint(self, client):
         """Test POST /cache/refresh endpoint."""
         response = client.post("/cache/refresh")
         
@@ -126,7 +129,7 @@ class TestCacheRouter:
         assert "success" in data
         assert "message" in data
     
-    def test_cache_invalidate_endpoint(self):
+    def test_cache_invalidate_endpoint(self, client):
         """Test DELETE /cache/{key} endpoint."""
         response = client.delete("/cache/test_key")
         
@@ -136,7 +139,7 @@ class TestCacheRouter:
         assert data["success"] is True
         assert "test_key" in data["message"]
     
-    def test_cache_get_endpoint_not_found(self):
+    def test_cache_get_endpoint_not_found(self, client):
         """Test GET /cache/{key} returns error for missing key."""
         # Clear cache first
         client.post("/cache/clear")
@@ -153,21 +156,20 @@ class TestCacheRouter:
 class TestMarketDataScheduler:
     """Test MarketDataScheduler class."""
     
-    def test_scheduler_initialization(self):
+    def test_scheduler_initialization(self, cache):
         """Test scheduler initializes correctly."""
-        cache = MarketDataCache(default_ttl_minutes=30)
         scheduler = MarketDataScheduler(
             cache=cache,
             refresh_interval_minutes=15,
             auto_start=False
         )
         
+        assert scheduler.cache is cache
         assert scheduler.refresh_interval == 15
         assert scheduler.is_running is False
     
-    def test_scheduler_status(self):
+    def test_scheduler_status(self, cache):
         """Test scheduler status."""
-        cache = MarketDataCache(default_ttl_minutes=30)
         scheduler = MarketDataScheduler(
             cache=cache,
             refresh_interval_minutes=15,
@@ -215,3 +217,15 @@ class TestCachedMarketData:
         assert result["cache_info"]["source"] == "test"
         assert "age_seconds" in result["cache_info"]
 
+    
+    def test_cached_data_uses_slots(self):
+        """Test cache entries carry no per-instance __dict__."""
+        cached = CachedMarketData(data={}, timestamp=datetime.now(), source="test")
+        
+        assert not hasattr(cached, "__dict__")
+    
+    def test_cached_data_age_from_monotonic_clock(self):
+        """Test age is measured from the monotonic creation time."""
+        cached = CachedMarketData(data={}, timestamp=datetime.now(), source="test", created_ns=1_000_000_000)
+        
+        assert cached.age_seconds(now_ns=3_500_000_000) == 2.5
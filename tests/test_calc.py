@@ -1,42 +1,47 @@
+import pytest
+
 from app.domain.calc import calculate, calculate_sale_summary
 
-sample_config = {
-    "new_apartment": {
-        "price_apartment": 80000,
-        "price_parking": 8000,
-        "include_parking_in_calculation": True,
-    },
-    "old_apartment": {
-        "purchase_price": 55000,
-        "surface_area_sqm": 50,
-        "market_price_per_sqm": 1400,
-    },
-    "exchange_rates": {
-        "eur_to_mdl": 19.5,
-        "eur_to_ron": 4.95,
-        "ron_to_mdl": 3.94,
-    },
-    "notary_tax": {"enabled": True, "percentage": 0.5},
-    "agent_fee": {"enabled": True, "percentage": 2},
-    "income_tax": {"enabled": True, "rate": 12},
-    "rental_income": {"enabled": True, "monthly_amount": 500, "months_lost": 2},
-    "currency_conversion": {"enabled": True},
-}
+@pytest.fixture
+def sample_config():
+    """A fresh config per test, so no test can see another's changes."""
+    return {
+        "new_apartment": {
+            "price_apartment": 80000,
+            "price_parking": 8000,
+            "include_parking_in_calculation": True,
+        },
+        "old_apartment": {
+            "purchase_price": 55000,
+            "surface_area_sqm": 50,
+            "market_price_per_sqm": 1400,
+        },
+        "exchange_rates": {
+            "eur_to_mdl": 19.5,
+            "eur_to_ron": 4.95,
+            "ron_to_mdl": 3.94,
+        },
+        "notary_tax": {"enabled": True, "percentage": 0.5},
+        "agent_fee": {"enabled": True, "percentage": 2},
+        "income_tax": {"enabled": True, "rate": 12},
+        "rental_income": {"enabled": True, "monthly_amount": 500, "months_lost": 2},
+        "currency_conversion": {"enabled": True},
+    }
 
-def test_calculate_basic():
+def test_calculate_basic(sample_config):
     result = calculate(sample_config)
     assert "salePrice" in result
     assert result["salePrice"] > 0
     assert result["net"] < result["salePrice"]
     assert 0 <= result["coverPct"] <= 200
 
-def test_sale_summary():
+def test_sale_summary(sample_config):
     sale = calculate_sale_summary(sample_config, amount=100000, currency="EUR")
     assert sale["sale_eur"] == 100000
     assert sale["sale_mdl"] == sale["sale_eur"] * sample_config["exchange_rates"]["eur_to_mdl"]
     assert sale["net_income_eur"] <= sale["sale_eur"]
 
-def test_sale_summary_mdl_conversion():
+def test_sale_summary_mdl_conversion(sample_config):
     amount_mdl = 195000  # should become 10_000 EUR at eur_to_mdl=19.5
     sale = calculate_sale_summary(sample_config, amount=amount_mdl, currency="MDL")
     assert abs(sale["sale_eur"] - (amount_mdl / sample_config["exchange_rates"]["eur_to_mdl"])) < 1e-6
@@ -1,17 +1,19 @@
 import sys, os
+import pytest
 from app.domain.calc import calculate, calculate_sale_summary, _f
 
-def test_helper_f_with_none():
-    assert _f(None) == 0.0
-    assert _f(None, 10.0) == 10.0
-
-def test_helper_f_with_empty_string():
-    assert _f("") == 0.0
-    assert _f("", 5.0) == 5.0
-
-def test_helper_f_with_valid():
-    assert _f(123.45) == 123.45
-    assert _f("678.9") == 678.9
+# default=None means the argument is omitted, exercising _f's own default
+@pytest.mark.parametrize("value,default,expected", [
+    (None, None, 0.0),
+    (None, 10.0, 10.0),
+    ("", None, 0.0),
+    ("", 5.0, 5.0),
+    (123.45, None, 123.45),
+    ("678.9", None, 678.9),
+])
+def test_helper_f(value, default, expected):
+    result = _f(value) if default is None else _f(value, default)
+    assert result == expected
 
 def test_calculate_without_parking():
     config = {
@@ -3,7 +3,11 @@ Tests for histogram / price distribution functionality.
 """
 
 import pytest
-from app.services.histogram import get_price_distribution_summary
+from app.services.histogram import (
+    build_price_histogram,
+    build_price_histogram_with_dominant,
+    get_price_distribution_summary,
+)
 
 
 def test_price_distribution_basic():
@@ -178,3 +182,30 @@ def test_price_distribution_count_accuracy():
     for bin in result["histogram"]:
         assert bin["count"] >= 0
 
+
+def test_build_price_histogram_presorted_matches_unsorted():
+    """Test the sorted-input path counts bins exactly like the general path."""
+    prices = [2200, 900, 1100, 3500, 1499.99, 1500, 4100, 1800, 3000, 2600]
+    
+    unsorted_bins = build_price_histogram(prices)
+    sorted_bins = build_price_histogram(sorted(prices), presorted=True)
+    
+    assert sorted_bins == unsorted_bins
+    assert [b.count for b in sorted_bins] == [1, 2, 1, 1, 1, 1, 1, 2]
+    assert build_price_histogram([], presorted=True) == []
+
+
+def test_build_price_histogram_with_dominant():
+    """Test the dominant bin is returned with the bins, first bin winning ties."""
+    prices = [1000, 1200, 1600, 1700, 2000]
+    
+    bins, dominant = build_price_histogram_with_dominant(prices)
+    
+    assert bins == build_price_histogram(prices)
+    assert dominant is bins[2]
+    assert dominant.label == "1500-1800"
+    assert build_price_histogram_with_dominant([]) == ([], None)
+    
+    # Tie between "<1100" and "1800-2200": the first bin wins
+    _, tied = build_price_histogram_with_dominant([900, 2000])
+    assert tied.label == "<1100"
@@ -3,54 +3,98 @@ Additional comprehensive tests for market router to increase coverage.
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
+import app.main
+from app.api.v1 import routes_market
 from app.scraping import proimobil, accesimobil, md999
+from app.services import market_service
+from app.services.cache import get_market_cache
 
-client = TestClient(app)
+MARKET_ENDPOINTS = [
+    "/market/proimobil",
+    "/market/accesimobil",
+    "/market/distribution",
+    "/market/quartiles",
+]
 
+_DEFAULT_PRICES = [1500, 1600, 1700]
+_DEFAULT_999MD_PRICES = [1550]
 
-def test_market_router_all_endpoints_exist(monkeypatch):
+# 50 prices per source for the large-dataset test
+_BIG_PROIMOBIL = tuple(range(1400, 1450))
+_BIG_ACCESIMOBIL = tuple(range(1500, 1550))
+_BIG_999MD = tuple(range(1600, 1650))
+
+
+# Modules that bind each scraper name, whether defining it or importing it directly
+_SCRAPER_BINDINGS = (
+    ("fetch_all_proimobil_prices", (proimobil, routes_market, app.main, market_service)),
+    ("fetch_all_prices_accesimobil", (accesimobil, routes_market, app.main, market_service)),
+    ("fetch_all_999md_prices", (md999, routes_market, app.main, market_service)),
+)
+
+
+def _stub_sources(monkeypatch, proimobil_prices, accesimobil_prices, md999_prices):
+    """Point the three scrapers at fixed price lists, everywhere they are bound.
+
+    Each call returns a fresh list: the stats code sorts scraper results in place.
+    """
+    async def fake_999md_prices(url):
+        return list(md999_prices)
+
+    fakes = (
+        lambda url: list(proimobil_prices),
+        lambda url: list(accesimobil_prices),
+        fake_999md_prices,
+    )
+    for (name, modules), fake in zip(_SCRAPER_BINDINGS, fakes):
+        for module in modules:
+            monkeypatch.setattr(module, name, fake)
+
+
+@pytest.fixture(autouse=True)
+def _mock_scrapers(monkeypatch):
+    """Stub every source by default; tests override only the prices they care about."""
+    _stub_sources(monkeypatch, _DEFAULT_PRICES, _DEFAULT_PRICES, _DEFAULT_999MD_PRICES)
+
+
+@pytest.fixture
+def cold_cache():
+    """Market cache without an accesimobil entry, so the endpoint recomputes."""
+    cache = get_market_cache()
+    cache.invalidate('accesimobil')
+    yield cache
+    cache.invalidate('accesimobil')
+
+
+@pytest.fixture
+def warm_market_cache(cold_cache):
+    """Market cache primed with accesimobil stats, so the endpoint skips the scraper."""
+    cold_cache.set('accesimobil', {
+        "source": "accesimobil.md",
+        "total_ads": 3,
+        "min_price_per_sqm": 1500.0,
+        "max_price_per_sqm": 1700.0,
+    }, source='test')
+    yield cold_cache
+
+
+@pytest.mark.parametrize("endpoint", MARKET_ENDPOINTS)
+def test_market_router_all_endpoints_exist(client, endpoint):
     """Test that all market endpoints are registered."""
-    def mock_prices(url):
-        return [1500, 1600, 1700]
-    
-    async def mock_999md_prices(url):
-        return [1550]
-    
-    monkeypatch.setattr(proimobil, "fetch_all_proimobil_prices", mock_prices)
-    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_prices)
-    monkeypatch.setattr(md999, "fetch_all_999md_prices", mock_999md_prices)
-    
-    # Test all endpoints respond
-    endpoints = [
-        "/market/proimobil",
-        "/market/accesimobil",
-        "/market/distribution",
-        "/market/quartiles"
-    ]
-    
-    for endpoint in endpoints:
-        response = client.get(endpoint)
-        assert response.status_code == 200, f"Endpoint {endpoint} failed"
+    response = client.get(endpoint)
+    assert response.status_code == 200, f"Endpoint {endpoint} failed"
 
 
 
-def test_distribution_with_many_prices(monkeypatch):
+def test_distribution_with_many_prices(client, monkeypatch):
     """Test distribution endpoint with large dataset."""
     # Create dataset with 100 prices
-    def mock_proimobil_prices(url):
-        return list(range(1400, 1450))
-    
-    def mock_accesimobil_prices(url):
-        return list(range(1500, 1550))
-    
-    async def mock_999md_prices(url):
-        return list(range(1600, 1650))
-    
-    monkeypatch.setattr(proimobil, "fetch_all_proimobil_prices", mock_proimobil_prices)
-    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_accesimobil_prices)
-    monkeypatch.setattr(md999, "fetch_all_999md_prices", mock_999md_prices)
+    _stub_sources(
+        monkeypatch,
+        proimobil_prices=_BIG_PROIMOBIL,
+        accesimobil_prices=_BIG_ACCESIMOBIL,
+        md999_prices=_BIG_999MD,
+    )
     
     response = client.get("/market/distribution")
     
@@ -61,21 +105,15 @@ def test_distribution_with_many_prices(monkeypatch):
     assert len(data["histogram"]) > 0
 
 
-def test_quartiles_with_outliers(monkeypatch):
+def test_quartiles_with_outliers(client, monkeypatch):
     """Test quartiles endpoint correctly handles outliers."""
     # Create data with extreme outliers
-    def mock_proimobil_prices(url):
-        return [1500, 1600, 1700, 1800, 10000, 15000]
-    
-    def mock_accesimobil_prices(url):
-        return [1400, 1500, 1600]
-    
-    async def mock_999md_prices(url):
-        return [500, 1550, 1650]
-    
-    monkeypatch.setattr(proimobil, "fetch_all_proimobil_prices", mock_proimobil_prices)
-    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_accesimobil_prices)
-    monkeypatch.setattr(md999, "fetch_all_999md_prices", mock_999md_prices)
+    _stub_sources(
+        monkeypatch,
+        proimobil_prices=[1500, 1600, 1700, 1800, 10000, 15000],
+        accesimobil_prices=[1400, 1500, 1600],
+        md999_prices=[500, 1550, 1650],
+    )
     
     response = client.get("/market/quartiles")
     data = response.json()
@@ -85,18 +123,15 @@ def test_quartiles_with_outliers(monkeypatch):
     assert data["outliers_percentage"] > 0
 
 
-def test_quartiles_market_width_narrow(monkeypatch):
+def test_quartiles_market_width_narrow(client, monkeypatch):
     """Test quartiles with narrow price range."""
     # All prices very close together
-    def mock_prices(url):
-        return [1700, 1720, 1740, 1760, 1780, 1800]
-    
-    async def mock_999md_prices(url):
-        return [1710, 1750]
-    
-    monkeypatch.setattr(proimobil, "fetch_all_proimobil_prices", mock_prices)
-    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_prices)
-    monkeypatch.setattr(md999, "fetch_all_999md_prices", mock_999md_prices)
+    _stub_sources(
+        monkeypatch,
+        proimobil_prices=[1700, 1720, 1740, 1760, 1780, 1800],
+        accesimobil_prices=[1700, 1720, 1740, 1760, 1780, 1800],
+        md999_prices=[1710, 1750],
+    )
     
     response = client.get("/market/quartiles")
     data = response.json()
@@ -108,21 +143,15 @@ def test_quartiles_market_width_narrow(monkeypatch):
     assert data["interpretation"]["market_width"] in ["narrow", "moderate", "wide"]
 
 
-def test_quartiles_market_width_wide(monkeypatch):
+def test_quartiles_market_width_wide(client, monkeypatch):
     """Test quartiles correctly identifies wide market."""
     # Prices very spread out to guarantee wide classification
-    def mock_proimobil_prices(url):
-        return [1000, 1200, 1400, 1600, 1800, 2000, 2200, 2400]
-
-    def mock_accesimobil_prices(url):
-        return [900, 1300, 1700, 2100, 2500, 2900]
-
-    async def mock_999md_prices(url):
-        return [1100, 1500, 1900, 2300, 2700]
-
-    monkeypatch.setattr(proimobil, "fetch_all_proimobil_prices", mock_proimobil_prices)
-    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_accesimobil_prices)
-    monkeypatch.setattr(md999, "fetch_all_999md_prices", mock_999md_prices)
+    _stub_sources(
+        monkeypatch,
+        proimobil_prices=[1000, 1200, 1400, 1600, 1800, 2000, 2200, 2400],
+        accesimobil_prices=[900, 1300, 1700, 2100, 2500, 2900],
+        md999_prices=[1100, 1500, 1900, 2300, 2700],
+    )
     
     response = client.get("/market/quartiles")
     data = response.json()
@@ -132,18 +161,15 @@ def test_quartiles_market_width_wide(monkeypatch):
     assert data["interpretation"]["market_width"] in ["moderate", "wide"]
 
 
-def test_quartiles_market_width_moderate(monkeypatch):
+def test_quartiles_market_width_moderate(client, monkeypatch):
     """Test quartiles correctly identifies moderate market."""
     # Prices moderately spread
-    def mock_prices(url):
-        return [1400, 1500, 1600, 1700, 1800, 1900, 2000]
-    
-    async def mock_999md_prices(url):
-        return [1550, 1750]
-    
-    monkeypatch.setattr(proimobil, "fetch_all_proimobil_prices", mock_prices)
-    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_prices)
-    monkeypatch.setattr(md999, "fetch_all_999md_prices", mock_999md_prices)
+    _stub_sources(
+        monkeypatch,
+        proimobil_prices=[1400, 1500, 1600, 1700, 1800, 1900, 2000],
+        accesimobil_prices=[1400, 1500, 1600, 1700, 1800, 1900, 2000],
+        md999_prices=[1550, 1750],
+    )
     
     response = client.get("/market/quartiles")
     data = response.json()
@@ -154,24 +180,15 @@ def test_quartiles_market_width_moderate(monkeypatch):
     assert data["interpretation"]["market_width"] in ["narrow", "moderate", "wide"]
 
 
-def test_distribution_dominant_range_calculation(monkeypatch):
+def test_distribution_dominant_range_calculation(client, monkeypatch):
     """Test that distribution correctly identifies dominant range."""
     # Most prices in middle range - make very concentrated
-    def mock_proimobil_prices(url):
-        # 25 prices all in 1700-1850 range
-        return [1700, 1750, 1800, 1850] * 6 + [1720]
-
-    def mock_accesimobil_prices(url):
-        # Just 2 outliers
-        return [1400, 2200]
-
-    async def mock_999md_prices(url):
-        # 1 price in middle range
-        return [1770]
-    
-    monkeypatch.setattr(proimobil, "fetch_all_proimobil_prices", mock_proimobil_prices)
-    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_accesimobil_prices)
-    monkeypatch.setattr(md999, "fetch_all_999md_prices", mock_999md_prices)
+    _stub_sources(
+        monkeypatch,
+        proimobil_prices=[1700, 1750, 1800, 1850] * 6 + [1720],  # 25 prices all in 1700-1850 range
+        accesimobil_prices=[1400, 2200],  # just 2 outliers
+        md999_prices=[1770],  # 1 price in middle range
+    )
     
     response = client.get("/market/distribution")
     data = response.json()
@@ -182,17 +199,14 @@ def test_distribution_dominant_range_calculation(monkeypatch):
     assert data["dominant_percentage"] >= 15  # At least 15% in dominant range (adjusted for real data, was 60%)
 
 
-def test_quartiles_percentages_range(monkeypatch):
+def test_quartiles_percentages_range(client, monkeypatch):
     """Test that quartile percentages are within valid range."""
-    def mock_prices(url):
-        return [1500, 1600, 1700, 1800, 1900, 2000]
-    
-    async def mock_999md_prices(url):
-        return [1550]
-    
-    monkeypatch.setattr(proimobil, "fetch_all_proimobil_prices", mock_prices)
-    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_prices)
-    monkeypatch.setattr(md999, "fetch_all_999md_prices", mock_999md_prices)
+    _stub_sources(
+        monkeypatch,
+        proimobil_prices=[1500, 1600, 1700, 1800, 1900, 2000],
+        accesimobil_prices=[1500, 1600, 1700, 1800, 1900, 2000],
+        md999_prices=[1550],
+    )
     
     response = client.get("/market/quartiles")
     data = response.json()
@@ -201,34 +215,17 @@ def test_quartiles_percentages_range(monkeypatch):
     assert 0 <= data["outliers_percentage"] <= 100
 
 
-def test_market_endpoints_return_valid_json(monkeypatch):
+@pytest.mark.parametrize("endpoint", MARKET_ENDPOINTS)
+def test_market_endpoints_return_valid_json(client, endpoint):
     """Test that all market endpoints return valid JSON."""
-    def mock_prices(url):
-        return [1500, 1600, 1700]
-    
-    async def mock_999md_prices(url):
-        return [1550]
-    
-    monkeypatch.setattr(proimobil, "fetch_all_proimobil_prices", mock_prices)
-    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_prices)
-    monkeypatch.setattr(md999, "fetch_all_999md_prices", mock_999md_prices)
-    
-    endpoints = [
-        "/market/proimobil",
-        "/market/accesimobil",
-        "/market/distribution",
-        "/market/quartiles"
-    ]
-    
-    for endpoint in endpoints:
-        response = client.get(endpoint)
-        assert response.status_code == 200
-        # Should be valid JSON
-        data = response.json()
-        assert isinstance(data, (dict, list))
+    response = client.get(endpoint)
+    assert response.status_code == 200
+    # Should be valid JSON
+    data = response.json()
+    assert isinstance(data, (dict, list))
 
 
-def test_proimobil_statistics_values(monkeypatch):
+def test_proimobil_statistics_values(client, monkeypatch):
     """Test that proimobil endpoint returns valid statistics."""
     def mock_prices(url):
         return [1500, 1600, 1700, 1800, 1900, 2000]
@@ -247,18 +244,13 @@ def test_proimobil_statistics_values(monkeypatch):
     assert data["q1_price_per_sqm"] < data["q3_price_per_sqm"]
 
 
-def test_accesimobil_statistics_values(monkeypatch):
+def test_accesimobil_statistics_values(client, cold_cache, monkeypatch):
     """Test that accesimobil endpoint returns valid statistics."""
     def mock_prices(url):
         return [1400, 1500, 1600, 1700, 1800]
     
     monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", mock_prices)
     
-    # Clear cache to ensure mock is used
-    from app.services.cache import get_market_cache
-    cache = get_market_cache()
-    cache.invalidate('accesimobil')
-
     response = client.get("/market/accesimobil")
     data = response.json()
     
@@ -268,3 +260,42 @@ def test_accesimobil_statistics_values(monkeypatch):
     assert data["total_ads"] == 5
     assert data["source"] == "accesimobil.md"
 
+
+def test_accesimobil_served_from_warm_cache(client, warm_market_cache, monkeypatch):
+    """Test a primed cache entry is returned without scraping."""
+    def fail(url):
+        raise AssertionError("cached stats should not trigger a scrape")
+    
+    monkeypatch.setattr(accesimobil, "fetch_all_prices_accesimobil", fail)
+    
+    response = client.get("/market/accesimobil")
+    data = response.json()
+    
+    assert response.status_code == 200
+    assert data["total_ads"] == 3
+    assert data["cache_info"]["source"] == "test"
+
+
+def test_aggregate_summary_scrapes_each_source_once(monkeypatch):
+    """Per-source stats and the aggregate share one scrape per site."""
+    import asyncio
+    calls = []
+
+    def counted(name, prices):
+        def fake(url):
+            calls.append(name)
+            return list(prices)
+        return fake
+
+    async def fake_999md(url):
+        calls.append("999md")
+        return [1550.0]
+
+    monkeypatch.setattr(app.main, "fetch_all_proimobil_prices", counted("proimobil", [1500.0, 1600.0, 1700.0]))
+    monkeypatch.setattr(app.main, "fetch_all_prices_accesimobil", counted("accesimobil", [1400.0, 1800.0]))
+    monkeypatch.setattr(app.main, "fetch_all_999md_prices", fake_999md)
+
+    summary = asyncio.run(app.main.compute_aggregate_market_summary())
+    assert sorted(calls) == ["999md", "accesimobil", "proimobil"]
+    assert [s.total_ads for s in summary["sources"][:3]] == [3, 2, 1]
+    assert summary["quartile_analysis"]["total_ads"] == 6
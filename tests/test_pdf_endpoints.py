@@ -1,6 +1,7 @@
-from fastapi.testclient import TestClient
-from app.main import app
-import app.main as main_module
+import json
+import re
+
+import pytest
 
 # Minimal config for PDF endpoints
 CONFIG = {
@@ -13,27 +14,39 @@ CONFIG = {
     "rental_income": {"enabled": False},
 }
 
+# Request bodies encoded once; every test posts the same bytes
+_JSON_HDRS = {"content-type": "application/json"}
+_PDF_BODY_JSON = json.dumps({'config': CONFIG}).encode()
+_SALE_SUMMARY_BODY_JSON = json.dumps({'config': CONFIG, 'amount': 100000, 'currency': 'EUR'}).encode()
+
+# Either wording of the calculation error message
+_PDF_ERR_RE = re.compile(rb"denom|Coefficients")
+
 class DummyHTML:
     def __init__(self, *args, **kwargs):
         pass
-    def write_pdf(self):
+    def write_pdf(self, *args, **kwargs):
         return b'%PDF-FAKE%'
 
-def test_pdf_generation(monkeypatch):
-    monkeypatch.setattr(main_module, 'HTML', DummyHTML)
-    client = TestClient(app)
-    resp = client.post('/pdf', json={'config': CONFIG})
+@pytest.fixture(scope="module", autouse=True)
+def fake_renderer():
+    """Render with DummyHTML for the whole module; WeasyPrint is never imported."""
+    from app.services.pdf import pdf_service
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(pdf_service, '_html_class', lambda: DummyHTML)
+        yield
+
+def test_pdf_generation(client):
+    resp = client.post('/pdf', content=_PDF_BODY_JSON, headers=_JSON_HDRS)
     assert resp.status_code == 200
     assert resp.content.startswith(b'%PDF')
 
-def test_pdf_sale_summary_generation(monkeypatch):
-    monkeypatch.setattr(main_module, 'HTML', DummyHTML)
-    client = TestClient(app)
-    resp = client.post('/pdf/sale-summary', json={'config': CONFIG, 'amount': 100000, 'currency': 'EUR'})
+def test_pdf_sale_summary_generation(client):
+    resp = client.post('/pdf/sale-summary', content=_SALE_SUMMARY_BODY_JSON, headers=_JSON_HDRS)
     assert resp.status_code == 200
     assert resp.content.startswith(b'%PDF')
 
-def test_pdf_generation_error(monkeypatch):
+def test_pdf_generation_error(client):
     """Test PDF generation with calculation error."""
     bad_config = {
         "new_apartment": {"price_apartment": 10000},
@@ -43,13 +56,12 @@ def test_pdf_generation_error(monkeypatch):
         "income_tax": {"enabled": True, "rate": 50},
         "currency_conversion": {"enabled": True},
     }
-    client = TestClient(app)
     resp = client.post('/pdf', json={'config': bad_config})
     assert resp.status_code == 400
-    assert b"denom" in resp.content or b"Coefficients" in resp.content
+    assert _PDF_ERR_RE.search(resp.content)
 
 
-def test_pdf_sale_summary_error():
+def test_pdf_sale_summary_error(client):
     """Test sale summary with invalid currency conversion."""
     bad_config = {
         "old_apartment": {"purchase_price": 10000},
@@ -57,6 +69,5 @@ def test_pdf_sale_summary_error():
         "agent_fee": {"enabled": False},
         "income_tax": {"enabled": False},
     }
-    client = TestClient(app)
     resp = client.post('/pdf/sale-summary', json={'config': bad_config, 'amount': 100000, 'currency': 'MDL'})
     assert resp.status_code == 400
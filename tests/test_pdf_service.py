@@ -41,6 +41,44 @@ def test_pdf_html_class_fallback():
     assert callable(HTMLCls)
 
 
+def test_pdf_service_defers_weasyprint_import():
+    """WeasyPrint is only imported once a PDF is actually rendered."""
+    import os
+    import subprocess
+    import sys
+
+    # A fresh interpreter: other tests in this process may already have rendered
+    src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src_dir, os.environ.get('PYTHONPATH')])))
+    subprocess.run(
+        [sys.executable, '-c',
+         "import sys, app.services.pdf.pdf_service as pdf_service; "
+         "assert 'weasyprint' not in sys.modules; "
+         "assert pdf_service._weasyprint.cache_info().currsize == 0"],
+        env=env, check=True,
+    )
+
+
+def test_pdf_font_config_is_per_thread(monkeypatch):
+    """Each thread reuses its own font configuration; threads never share one."""
+    import threading
+    import app.services.pdf.pdf_service as pdf_service
+    from app.services.pdf.pdf_service import _font_config
+
+    class FakeFontConfiguration:
+        pass
+
+    monkeypatch.setattr(pdf_service, '_thread_fonts', threading.local())
+    main_config = _font_config(FakeFontConfiguration)
+    assert _font_config(FakeFontConfiguration) is main_config
+
+    other = []
+    worker = threading.Thread(target=lambda: other.append(_font_config(FakeFontConfiguration)))
+    worker.start()
+    worker.join()
+    assert other[0] is not main_config
+
+
 def test_pdf_service_module_structure():
     """Test that PDF service module has expected structure."""
     import app.services.pdf.pdf_service as pdf_service
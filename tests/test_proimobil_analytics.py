@@ -0,0 +1,73 @@
+"""
+Tests for proimobil listing analytics (time on market, reservations, engagement).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.domain.proimobil_models import ProimobilListing
+from app.services.proimobil_analytics import compute_proimobil_analytics
+
+
+def make_listing(idx: int, age_days: int, **overrides) -> ProimobilListing:
+    now = datetime.now(timezone.utc)
+    data = {
+        "id": str(idx),
+        "offer": "sell",
+        "category": "apartment",
+        "status": "active",
+        "is_hot": False,
+        "is_exclusive": False,
+        "deal": False,
+        "booked": False,
+        "order": 0,
+        "views": 0,
+        "price_eur": 70000.0,
+        "price_per_sqm": 1400.0,
+        "city": "Chișinău",
+        "city_id": 1,
+        "surface_sqm": 50.0,
+        "updated_at": now,
+        "created_at": now - timedelta(days=age_days),
+    }
+    data.update(overrides)
+    return ProimobilListing(**data)
+
+
+def test_analytics_empty():
+    analytics = compute_proimobil_analytics([])
+    assert analytics.total_listings == 0
+    assert analytics.time_on_market.max_days == 0
+    assert analytics.engagement.views_per_day_avg == 0.0
+    assert analytics.hot_offers_ratio == 0.0
+    assert analytics.time_on_market_by_group.by_sector == {}
+
+
+def test_analytics_aggregates():
+    listings = [
+        make_listing(1, 0, sector="Botanica", rooms=2, views=10, booked=True, is_hot=True),
+        make_listing(2, 4, sector="Botanica", rooms=1, views=40, deal=True, order=3),
+        make_listing(3, 10, sector="Centru", rooms=2, views=100, is_exclusive=True, order=1),
+    ]
+    analytics = compute_proimobil_analytics(listings)
+
+    assert analytics.total_listings == 3
+    assert analytics.time_on_market.avg_days == 14 / 3
+    assert analytics.time_on_market.median_days == 4.0
+    assert analytics.time_on_market.max_days == 10
+
+    assert analytics.reservations.total_booked == 1
+    assert analytics.reservations.total_sold == 1
+    assert analytics.reservations.avg_orders_per_listing == 4 / 3
+
+    assert analytics.engagement.avg_views_per_listing == 50.0
+    # ages are clamped to at least one day when normalizing views
+    assert analytics.engagement.views_per_day_avg == (10 / 1 + 40 / 4 + 100 / 10) / 3
+
+    assert analytics.hot_offers_ratio == 1 / 3
+    assert analytics.exclusive_ratio == 1 / 3
+
+    groups = analytics.time_on_market_by_group
+    assert set(groups.by_sector) == {"Botanica", "Centru"}
+    assert groups.by_sector["Botanica"].max_days == 4
+    assert set(groups.by_rooms) == {"1", "2"}
+    assert groups.by_state == {}
@@ -2,15 +2,18 @@
 Tests for proimobil REST API implementation.
 """
 
-from unittest.mock import Mock, patch
+import pytest
+from unittest.mock import patch
 from app.scraping.proimobil_api import (
     ProimobilAPIListing,
     fetch_proimobil_api_page,
+    fetch_all_proimobil_api_listings,
     _parse_property_from_api_response,
 )
+from app.services.cache import get_market_cache
 from app.services.proimobil_api_service import (
     compute_proimobil_api_stats,
-    get_detailed_proimobil_api_listings
+    get_detailed_proimobil_api_listings,
 )
 
 
@@ -178,98 +181,135 @@ class TestParsePropertyFromAPIResponse:
         assert listing.surface_sqm == 50.0
 
 
+class FakeResponse:
+    """Minimal stand-in for requests.Response carrying a fixed JSON payload."""
+    
+    def __init__(self, payload):
+        self._payload = payload
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Session double: returns a canned response, or raises the given error."""
+    
+    def __init__(self, payload=None, error=None):
+        self._payload = payload
+        self._error = error
+    
+    def get(self, url, **kwargs):
+        if self._error is not None:
+            raise self._error
+        return FakeResponse(self._payload)
+
+
+API_PAGE = [
+    {
+        "price": {"amount": 88900},
+        "surface": {"value": 50.0},
+        "rooms": 2,
+        "offer": "vânzare",
+        "category": "apartament",
+        "status": "activ",
+        "isHot": False,
+        "isExclusive": False,
+        "deal": False,
+        "booked": False,
+        "order": 0,
+        "views": 0,
+        "floor": 1,
+        "numberOfFloors": 5,
+        "bathrooms": 1,
+        "bedrooms": 2,
+        "balcony": 1,
+        "state": "",
+        "parking": "",
+        "condition": "",
+        "updatedAt": "2025-11-20T12:44:30.000Z",
+        "createdAt": "2025-11-18T15:07:26.000Z",
+        "cityId": "a36a231f-a54e-43e3-8c72-2c9204bc9a59",
+        "i18n": {
+            "ro": {
+                "url": "test",
+                "address": "Test St",
+                "description": "2 camere, 50 mp",
+                "characteristics": [
+                    {"name": "Suprafața totală", "value": "50 m2"},
+                    {"name": "Camere", "value": "2"}
+                ]
+            }
+        },
+        "_embedded": {
+            "city": {"i18n": {"ro": {"name": "Chișinău"}}},
+            "region": {"i18n": {"ro": {"name": "Test"}}}
+        }
+    }
+]
 
 
 class TestFetchProimobilAPI:
     """Test fetching from proimobil API."""
     
-    @patch('app.scraping.proimobil_api.requests.get')
-    def test_fetch_api_page_success(self, mock_get):
+    def test_fetch_api_page_success(self):
         """Test successful API fetch."""
-        mock_response = Mock()
-        mock_response.json.return_value = [
-            {
-                "price": {"amount": 88900},
-                "surface": {"value": 50.0},
-                "rooms": 2,
-                "offer": "vânzare",
-                "category": "apartament",
-                "status": "activ",
-                "isHot": False,
-                "isExclusive": False,
-                "deal": False,
-                "booked": False,
-                "order": 0,
-                "views": 0,
-                "floor": 1,
-                "numberOfFloors": 5,
-                "bathrooms": 1,
-                "bedrooms": 2,
-                "balcony": 1,
-                "state": "",
-                "parking": "",
-                "condition": "",
-                "updatedAt": "2025-11-20T12:44:30.000Z",
-                "createdAt": "2025-11-18T15:07:26.000Z",
-                "cityId": "a36a231f-a54e-43e3-8c72-2c9204bc9a59",
-                "i18n": {
-                    "ro": {
-                        "url": "test",
-                        "address": "Test St",
-                        "description": "2 camere, 50 mp",
-                        "characteristics": [
-                            {"name": "Suprafața totală", "value": "50 m2"},
-                            {"name": "Camere", "value": "2"}
-                        ]
-                    }
-                },
-                "_embedded": {
-                    "city": {"i18n": {"ro": {"name": "Chișinău"}}},
-                    "region": {"i18n": {"ro": {"name": "Test"}}}
-                }
-            }
-        ]
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
-        
-        listings = fetch_proimobil_api_page(offset=0, limit=10)
+        listings = fetch_proimobil_api_page(offset=0, limit=10, session=FakeSession(API_PAGE))
         
         assert len(listings) == 1
         assert listings[0].price_eur == 88900.0
     
-    @patch('app.scraping.proimobil_api.requests.get')
-    def test_fetch_api_page_empty_response(self, mock_get):
+    def test_fetch_api_page_empty_response(self):
         """Test API returns empty list."""
-        mock_response = Mock()
-        mock_response.json.return_value = []
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
-        
-        listings = fetch_proimobil_api_page(offset=0, limit=10)
+        listings = fetch_proimobil_api_page(offset=0, limit=10, session=FakeSession([]))
         
         assert len(listings) == 0
     
-    @patch('app.scraping.proimobil_api.requests.get')
-    def test_fetch_api_page_request_error(self, mock_get):
+    def test_fetch_api_page_request_error(self):
         """Test handles request errors gracefully."""
-        mock_get.side_effect = Exception("Connection error")
+        session = FakeSession(error=Exception("Connection error"))
         
-        listings = fetch_proimobil_api_page(offset=0, limit=10)
+        listings = fetch_proimobil_api_page(offset=0, limit=10, session=session)
         
         assert len(listings) == 0
+    
+    def test_fetch_all_stops_at_first_short_page(self):
+        """Concurrent pages are kept in offset order up to the first short page."""
+        sell = dict(API_PAGE[0], offer="sell")
+        pages = {0: [sell] * 150, 150: [sell] * 2, 300: [sell] * 150}
+        
+        class PagedSession:
+            def get(self, url, params, **kwargs):
+                return FakeResponse(pages.get(params["offset"], []))
+        
+        listings = fetch_all_proimobil_api_listings(max_items=600, session=PagedSession())
+        
+        assert len(listings) == 152
+
+
+# Built once; the stats service only reads listings
+_STATS_LISTINGS = (
+    ProimobilAPIListing(80000, "Test", "a36a231f-a54e-43e3-8c72-2c9204bc9a59", "Test", "Test Street", 50.0, 2, "vânzare", "apartment", "activ", False, False, False, False, 0, 0, 1, 5, 2, 1, 2, "old", "", "", None, None, None),  # 1600.0 €/m2
+    ProimobilAPIListing(100000, "Test", "a36a231f-a54e-43e3-8c72-2c9204bc9a59", "Test", "Test Street", 50.0, 2, "vânzare", "apartment", "activ", False, False, False, False, 0, 0, 1, 5, 2, 1, 2, "old", "", "", None, None, None),  # 2000.0 €/m2
+    ProimobilAPIListing(120000, "Test", "a36a231f-a54e-43e3-8c72-2c9204bc9a59", "Test", "Test Street", 60.0, 2, "vânzare", "apartment", "activ", False, False, False, False, 0, 0, 1, 5, 2, 1, 2, "old", "", "", None, None, None),  # 2000.0 €/m2
+)
 
 
 class TestProimobilAPIService:
     """Test proimobil API service functions."""
     
+    @pytest.fixture(autouse=True)
+    def _fresh_listings_cache(self):
+        get_market_cache().clear()
+        yield
+        get_market_cache().clear()
+    
     @patch('app.services.proimobil_api_service.fetch_all_proimobil_api_listings')
     def test_compute_stats_success(self, mock_fetch):
         """Test computing stats from listings."""
-        mock_fetch.return_value = [
-            ProimobilAPIListing(80000, "Test", "a36a231f-a54e-43e3-8c72-2c9204bc9a59", "Test","Test Street", 50.0, 2, "vânzare", "apartment", "activ", False, False, False, False, 0, 0, 1, 5, 2, 1, 2, "old", "", "", None, None, None),  # 1600.0 €/m2
-            ProimobilAPIListing(100000, "Test", "a36a231f-a54e-43e3-8c72-2c9204bc9a59", "Test", "Test Street", 50.0, 2, "vânzare", "apartment", "activ", False, False, False, False, 0, 0, 1, 5, 2, 1, 2, "old", "", "", None, None, None),  # 2000.0 €/m2
-            ProimobilAPIListing(120000, "Test", "a36a231f-a54e-43e3-8c72-2c9204bc9a59", "Test", "Test Street", 60.0, 2, "vânzare", "apartment", "activ", False, False, False, False, 0, 0, 1, 5, 2, 1, 2, "old", "", "", None, None, None),  # 2000.0 €/m2
-        ]
+        mock_fetch.return_value = list(_STATS_LISTINGS)
         
         stats = compute_proimobil_api_stats(max_items=100)
         
@@ -303,3 +343,36 @@ class TestProimobilAPIService:
         assert listings[0]["price_eur"] == 100000
         assert listings[0]["city"] == "Chișinău"
         assert "url" in listings[0]
+
+    @patch('app.services.proimobil_api_service.fetch_all_proimobil_api_listings')
+    def test_listings_fetch_reused(self, mock_fetch):
+        """Stats and detailed listings share one fetch unless use_cache=False."""
+        mock_fetch.return_value = [
+            ProimobilAPIListing(80000, "Test", "a36a231f-a54e-43e3-8c72-2c9204bc9a59", "Test", "Test Street", 50.0, 2, "vânzare", "apartment", "activ", False, False, False, False, 0, 0, 1, 5, 2, 1, 2, "old", "", "", None, None, None),
+        ]
+        
+        compute_proimobil_api_stats(max_items=100)
+        get_detailed_proimobil_api_listings(max_items=100)
+        assert mock_fetch.call_count == 1
+        
+        compute_proimobil_api_stats(max_items=100, use_cache=False)
+        assert mock_fetch.call_count == 2
+        
+        get_market_cache().clear()
+        get_detailed_proimobil_api_listings(max_items=100)
+        assert mock_fetch.call_count == 3
+
+    @patch('app.services.proimobil_api_service.fetch_all_proimobil_api_listings')
+    def test_listings_cached_in_market_cache(self, mock_fetch, client):
+        """Fetched listings live in the market cache as plain dicts: readable via /cache/{key}, dropped by /cache/clear."""
+        mock_fetch.return_value = list(_STATS_LISTINGS)
+        compute_proimobil_api_stats(max_items=100)
+        
+        response = client.get("/cache/proimobil_api_fetch_100")
+        assert response.status_code == 200
+        listings = response.json()["data"]["listings"]
+        assert [l["price_eur"] for l in listings] == [80000, 100000, 120000]
+        
+        client.post("/cache/clear")
+        compute_proimobil_api_stats(max_items=100)
+        assert mock_fetch.call_count == 2
@@ -42,6 +42,22 @@ def test_proimobil_no_pagination():
     total = market_proimobil.detect_total_pages(html)
     assert total == 1
 
+def test_proimobil_detect_total_pages_with_link_attributes():
+    html = ("<nav class='Pagination_pagination__abc'><ul>"
+            "<li><a href='?page=1'> 1 </a></li><li><a href='?page=12'>12</a></li>"
+            "<li><a href='?page=2'>›</a></li></ul></nav><a>99</a>")
+    assert market_proimobil.detect_total_pages(html) == 12
+
+def test_proimobil_detect_total_pages_nested_label():
+    html = ("<nav class='Pagination_pagination__abc'><ul>"
+            "<li><a>1</a></li><li><a><span>7</span></a></li></ul></nav>")
+    assert market_proimobil.detect_total_pages(html) == 7
+
+def test_proimobil_detect_total_pages_entity_label():
+    html = ("<NAV class=Pagination_pagination__x><UL>"
+            "<LI><A>1</A></LI><LI><A>3&nbsp;</A></LI></UL></NAV>")
+    assert market_proimobil.detect_total_pages(html) == 3
+
 def test_proimobil_extract_price_helpers():
     assert market_proimobil.extract_price("140,000 €") == 140000.0
     assert market_proimobil.extract_price("invalid") is None
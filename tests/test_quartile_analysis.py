@@ -6,7 +6,9 @@ import pytest
 from app.services.quartile_analysis import (
     calculate_quartiles,
     remove_outliers_iqr,
-    get_quartile_interpretation
+    get_quartile_interpretation,
+    classify_prices,
+    median_of_sorted
 )
 
 
@@ -109,6 +111,16 @@ def test_remove_outliers_iqr_small_dataset():
     assert num_removed == 0
 
 
+def test_remove_outliers_iqr_presorted_matches_unsorted():
+    """Presorted input gives the same outlier count as the unsorted path."""
+    prices = [5000, 1500, 1700, 100, 1600, 1800, 1550, 1650]
+    
+    _, expected = remove_outliers_iqr(prices)
+    _, num_removed = remove_outliers_iqr(sorted(prices), presorted=True)
+    
+    assert num_removed == expected == 2
+
+
 def test_get_quartile_interpretation():
     """Test quartile interpretation function."""
     q1 = 1500.0
@@ -168,3 +180,38 @@ def test_quartiles_precision():
     assert quartiles['q3'] == round(quartiles['q3'], 2)
     assert quartiles['iqr'] == round(quartiles['iqr'], 2)
 
+
+def test_median_of_sorted_matches_statistics_median():
+    """Test direct-index median on sorted input for odd and even lengths."""
+    import statistics
+    
+    for prices in ([1500], [1200, 1800], [1200, 1400, 1500], [1000, 1200, 1400, 2000]):
+        assert median_of_sorted(prices) == statistics.median(prices)
+    
+    with pytest.raises(ValueError):
+        median_of_sorted([])
+
+
+def test_calculate_quartiles_matches_statistics_quantiles():
+    """Test quartiles agree with statistics.quantiles for odd and even sizes."""
+    import statistics
+    
+    for prices in ([1200, 1800], [1000, 1500, 2200], [900, 1200, 1400, 1600, 2000, 2600]):
+        q1, q2, q3 = statistics.quantiles(prices, n=4)
+        quartiles = calculate_quartiles(prices)
+        assert quartiles['q1'] == round(q1, 2)
+        assert quartiles['q2'] == round(q2, 2)
+        assert quartiles['q3'] == round(q3, 2)
+
+
+def test_classify_prices_matches_interpretation():
+    """Test batch classification gives the same labels as single calls."""
+    q1 = 1500
+    q3 = 2000
+    prices = [1200, 1275, 1400, 1500, 1600, 1750, 1800, 2000, 2050, 2300, 2500]
+    
+    labels = classify_prices(prices, q1, q3)
+    
+    assert labels == [get_quartile_interpretation(p, q1, q3) for p in prices]
+    assert labels[:4] == ["below_market", "budget", "budget", "affordable"]
+    assert classify_prices([], q1, q3) == []
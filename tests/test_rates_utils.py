@@ -1,3 +1,4 @@
+import pytest
 import datetime as dt
 import app.domain.rates_utils as rates_utils
 
@@ -59,6 +60,17 @@ def test_fetch_eur_mdl_from_bnm(monkeypatch):
     assert 'BNM official' in label
 
 
+def test_fetch_eur_mdl_from_bnm_does_not_expand_entities():
+    class EntitySession:
+        def get(self, url, **kwargs):
+            return FakeResp(
+                b'<?xml version="1.0"?><!DOCTYPE ValCurs [<!ENTITY rate "99.9">]>'
+                b'<ValCurs Date="01.01.2025"><Valute><CharCode>EUR</CharCode>'
+                b'<Value>&rate;</Value></Valute></ValCurs>'
+            )
+    with pytest.raises(RuntimeError, match="EUR not found"):
+        rates_utils.fetch_eur_mdl_from_bnm(EntitySession())
+
 def test_fetch_eur_ron_from_bnr(monkeypatch):
     monkeypatch.setattr(rates_utils, '_get_session', lambda: FakeSession())
     rate,label = rates_utils.fetch_eur_ron_from_bnr()
@@ -77,10 +89,19 @@ def test_fetch_ron_mdl_from_bnm_xls(monkeypatch):
 def test_fetch_all_rates(monkeypatch):
     monkeypatch.setattr(rates_utils, '_get_session', lambda: FakeSession())
     monkeypatch.setattr(rates_utils.xlrd, 'open_workbook', lambda file_contents: FakeBook())
-    rates_utils._RATES_CACHE_TS = None
-    rates_utils._RATES_CACHE.clear()
+    rates_utils.clear_rates_cache()
     data = rates_utils.fetch_all_rates(use_cache=False)
     assert set(['eur_to_mdl','eur_to_ron','ron_to_mdl']).issubset(data.keys())
     # second call served from cache
     data2 = rates_utils.fetch_all_rates(use_cache=True)
     assert data2 is rates_utils._RATES_CACHE
+
+
+def test_rates_cache_expires_on_monotonic_clock(monkeypatch):
+    monkeypatch.setattr(rates_utils, '_get_session', lambda: FakeSession())
+    monkeypatch.setattr(rates_utils.xlrd, 'open_workbook', lambda file_contents: FakeBook())
+    rates_utils.clear_rates_cache()
+    rates_utils.fetch_all_rates(use_cache=False)
+    assert rates_utils._cache_valid()
+    rates_utils._RATES_CACHE_TS -= rates_utils._RATES_CACHE_TTL_SECONDS
+    assert not rates_utils._cache_valid()
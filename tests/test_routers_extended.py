@@ -3,14 +3,10 @@ Additional tests for misc and rates routers.
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
 import app.domain.rates_utils as rates_utils
 
-client = TestClient(app)
 
-
-def test_day_endpoint():
+def test_day_endpoint(client):
     """Test /day endpoint."""
     response = client.get("/day")
     
@@ -31,23 +27,33 @@ def test_day_endpoint():
     assert "T" in data["full_date"] or "-" in data["full_date"]
 
 
-def test_rates_endpoint(monkeypatch):
-    """Test /rates endpoint."""
+_FAKE_RATES = {
+    "date": "2025-11-15",
+    "eur_to_mdl": 19.5,
+    "eur_to_mdl_label": "BNM official EUR/MDL (XML, 15.11.2025)",
+    "eur_to_ron": 4.95,
+    "eur_to_ron_label": "BNR official EUR/RON (XML, 15.11.2025)",
+    "ron_to_mdl": 3.94,
+    "ron_to_mdl_label": "BNM medium MDL/RON (XLS, 15.11.2025)",
+}
+
+
+@pytest.fixture(scope="module")
+def rates_calls(main_module):
+    """Serve _FAKE_RATES from app.main.fetch_all_rates for the module; records each call."""
+    calls = []
+
     def fake_fetch_all_rates(use_cache=True):
-        return {
-            "date": "2025-11-15",
-            "eur_to_mdl": 19.5,
-            "eur_to_mdl_label": "BNM official EUR/MDL (XML, 15.11.2025)",
-            "eur_to_ron": 4.95,
-            "eur_to_ron_label": "BNR official EUR/RON (XML, 15.11.2025)",
-            "ron_to_mdl": 3.94,
-            "ron_to_mdl_label": "BNM medium MDL/RON (XLS, 15.11.2025)",
-        }
-    
-    # Import main module to monkeypatch
-    import app.main as main_module
-    monkeypatch.setattr(main_module, "fetch_all_rates", fake_fetch_all_rates)
-    
+        calls.append(use_cache)
+        return _FAKE_RATES
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(main_module, "fetch_all_rates", fake_fetch_all_rates)
+        yield calls
+
+
+def test_rates_endpoint(client, rates_calls):
+    """Test /rates endpoint."""
     response = client.get("/rates")
     
     assert response.status_code == 200
@@ -60,36 +66,22 @@ def test_rates_endpoint(monkeypatch):
     assert data["eur_to_ron"] == 4.95
 
 
-def test_rates_endpoint_with_cache(monkeypatch):
+def test_rates_endpoint_with_cache(client, rates_calls):
     """Test that rates endpoint uses cache."""
-    call_count = {"count": 0}
-    
-    def fake_fetch_with_counter(use_cache=True):
-        call_count["count"] += 1
-        return {
-            "date": "2025-11-15",
-            "eur_to_mdl": 19.5,
-            "eur_to_ron": 4.95,
-            "ron_to_mdl": 3.94,
-        }
-    
-    import app.main as main_module
-    monkeypatch.setattr(main_module, "fetch_all_rates", fake_fetch_with_counter)
-    
     # First call
     response1 = client.get("/rates")
     assert response1.status_code == 200
-    first_count = call_count["count"]
+    first_count = len(rates_calls)
     
     # Second call should use cache
     response2 = client.get("/rates")
     assert response2.status_code == 200
     
     # Function should be called (but internal caching happens in fetch_all_rates)
-    assert call_count["count"] >= first_count
+    assert len(rates_calls) >= first_count
 
 
-def test_openapi_endpoint():
+def test_openapi_endpoint(client):
     """Test OpenAPI JSON endpoint."""
     response = client.get("/openapi.json")
     
@@ -102,7 +94,7 @@ def test_openapi_endpoint():
     assert "title" in data["info"]
 
 
-def test_docs_endpoint():
+def test_docs_endpoint(client):
     """Test Swagger docs endpoint."""
     response = client.get("/docs")
     
@@ -110,7 +102,7 @@ def test_docs_endpoint():
     assert "text/html" in response.headers["content-type"]
 
 
-def test_redoc_endpoint():
+def test_redoc_endpoint(client):
     """Test ReDoc endpoint."""
     response = client.get("/redoc")
     
@@ -118,7 +110,7 @@ def test_redoc_endpoint():
     assert "text/html" in response.headers["content-type"]
 
 
-def test_health_check():
+def test_health_check(client):
     """Test that the app is running."""
     # Test that we can make a request
     response = client.get("/docs")
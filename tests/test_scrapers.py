@@ -23,6 +23,12 @@ ACCESIMOBIL_HTML_PAGE_1 = '''<div class="foo products"><div class="rs-card"><div
 
 ACCESIMOBIL_HTML_PAGE_2 = '''<div class="foo products"><div class="rs-card"><div class="mortgage">€6 / m², Mortgage Y</div></div></div>'''
 
+# Pages served by the fakes, keyed by the exact URL the scrapers build
+_PROIMOBIL_PAGES = {
+    'http://example.com': PROIMOBIL_HTML_PAGE_1,
+    'http://example.com&page=2': PROIMOBIL_HTML_PAGE_2,
+}
+
 
 def test_proimobil_extract_prices():
     prices = market_proimobil.extract_prices_from_page(PROIMOBIL_HTML_PAGE_1)
@@ -30,11 +36,7 @@ def test_proimobil_extract_prices():
 
 
 def test_proimobil_fetch_all(monkeypatch):
-    def fake_fetch_html(url: str):
-        if 'page=2' in url:
-            return PROIMOBIL_HTML_PAGE_2
-        return PROIMOBIL_HTML_PAGE_1
-    monkeypatch.setattr(market_proimobil, 'fetch_html', fake_fetch_html)
+    monkeypatch.setattr(market_proimobil, 'fetch_html', _PROIMOBIL_PAGES.__getitem__)
     prices = market_proimobil.fetch_all_proimobil_prices('http://example.com')
     assert len(prices) == 2
     assert round(prices[0],2) == 2800.0
@@ -46,16 +48,30 @@ def test_accesimobil_extract_prices():
     assert prices == [5.0]
 
 
+class FakeResponse:
+    """Minimal stand-in for requests.Response carrying page HTML."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+_ACCESIMOBIL_PAGES = {
+    'http://example.com': FakeResponse(ACCESIMOBIL_HTML_PAGE_1),
+    'http://example.com&page=2': FakeResponse(ACCESIMOBIL_HTML_PAGE_2),
+}
+
+
+class FakeAccesimobilSession:
+    """Session double serving the accesimobil fixtures by URL."""
+
+    def get(self, url, **kwargs):
+        return _ACCESIMOBIL_PAGES[url]
+
+
 def test_accesimobil_fetch_all(monkeypatch):
-    def fake_session_get(url, timeout=15, verify=False):
-        class R:
-            def __init__(self, text):
-                self.text = text
-            def raise_for_status(self):
-                pass
-        if 'page=2' in url:
-            return R(ACCESIMOBIL_HTML_PAGE_2)
-        return R(ACCESIMOBIL_HTML_PAGE_1)
-    monkeypatch.setattr(market_accesimobil, '_session', type('S', (), {'get': fake_session_get}))
+    monkeypatch.setattr(market_accesimobil, '_session', FakeAccesimobilSession())
     prices = market_accesimobil.fetch_all_prices_accesimobil('http://example.com')
     assert prices == [5.0, 6.0]
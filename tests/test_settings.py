@@ -15,10 +15,8 @@ def test_get_settings_singleton():
     assert settings1 is settings2
 
 
-def test_settings_defaults():
+def test_settings_defaults(settings):
     """Test default settings values."""
-    settings = get_settings()
-
     # Check that defaults exist
     assert settings.log_level in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
     assert settings.market_summary_ttl_minutes > 0
@@ -26,29 +24,24 @@ def test_settings_defaults():
     assert isinstance(settings.cors_origins, list)
 
 
-def test_settings_env_prefix():
+def test_settings_env_prefix(settings):
     """Test that settings use APP_ prefix."""
     # This is implicit in Settings class with env_prefix
-    settings = get_settings()
     assert hasattr(settings, 'log_level')
     assert hasattr(settings, 'accesimobil_url')
     assert hasattr(settings, 'proimobil_url')
 
 
-def test_settings_quartile_config():
+def test_settings_quartile_config(settings):
     """Test quartile-related settings."""
-    settings = get_settings()
-
     assert hasattr(settings, 'enable_999md_scraper')
     assert hasattr(settings, 'max_999md_pages')
     assert isinstance(settings.enable_999md_scraper, bool)
     assert isinstance(settings.max_999md_pages, int)
 
 
-def test_settings_urls():
+def test_settings_urls(settings):
     """Test that URL settings are valid strings."""
-    settings = get_settings()
-
     assert isinstance(settings.accesimobil_url, str)
     assert isinstance(settings.proimobil_url, str)
     assert isinstance(settings.md999_url, str)
@@ -59,9 +52,7 @@ def test_settings_urls():
     assert settings.md999_url.startswith('http')
 
 
-def test_settings_cache_ttl():
+def test_settings_cache_ttl(settings):
     """Test cache TTL settings."""
-    settings = get_settings()
-
     assert settings.market_summary_ttl_minutes >= 1
     assert settings.fx_cache_ttl_seconds >= 60
@@ -6,6 +6,8 @@ Usage: python update_username.py your_github_username
 import sys
 from pathlib import Path
 
+PLACEHOLDER = b"YOUR_USERNAME"
+
 def update_username(username: str):
     """Replace YOUR_USERNAME with actual username in all relevant files."""
 
@@ -20,26 +22,26 @@ def update_username(username: str):
     ]
 
     project_root = Path(__file__).parent
+    username_bytes = username.encode('utf-8')
     updated_count = 0
 
     for filename in files_to_update:
         filepath = project_root / filename
 
-        if not filepath.exists():
-            print(f"⚠️  Skipping {filename} (not found)")
-            continue
-
         try:
-            content = filepath.read_text(encoding='utf-8')
+            # Bytes in, bytes out: no decode/encode pass and line endings are left untouched
+            content = filepath.read_bytes()
 
-            if "YOUR_USERNAME" in content:
-                new_content = content.replace("YOUR_USERNAME", username)
-                filepath.write_text(new_content, encoding='utf-8')
+            if PLACEHOLDER in content:
+                filepath.write_bytes(content.replace(PLACEHOLDER, username_bytes))
                 updated_count += 1
                 print(f"✅ Updated {filename}")
             else:
                 print(f"ℹ️  No changes needed in {filename}")
 
+        except FileNotFoundError:
+            # Opening the file is the existence check; no separate stat per file
+            print(f"⚠️  Skipping {filename} (not found)")
         except Exception as e:
             print(f"❌ Error updating {filename}: {e}")
 